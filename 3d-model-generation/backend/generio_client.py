@@ -0,0 +1,205 @@
+"""
+Async Generio API client
+
+One httpx.AsyncClient per process keeps TCP+TLS connections to the API alive
+between calls, every endpoint gets a timeout that fits how long it takes, and
+a semaphore bounds how many calls are in flight, so one worker can serve
+hundreds of generations without stalling the event loop.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+API_BASE = os.getenv("GENERIO_API_BASE", "https://test-api.generio.ai")
+AUTH_TOKEN = os.getenv("AUTH_TOKEN")
+
+# Calls in flight at once; more wait for a free slot instead of piling onto the API
+MAX_CONCURRENCY = int(os.getenv("GENERIO_MAX_CONCURRENCY", "64"))
+MAX_KEEPALIVE = int(os.getenv("GENERIO_MAX_KEEPALIVE", str(MAX_CONCURRENCY)))
+
+# Uploaded images remembered by SHA-256, so sending the same bytes again reuses the asset
+UPLOAD_CACHE_SIZE = int(os.getenv("GENERIO_UPLOAD_CACHE_SIZE", "4096"))
+# Image bytes base64-encoded per piece of the upload body; a multiple of 3 so pieces concatenate
+UPLOAD_CHUNK = 3 * 64 * 1024
+
+# Connect timeouts stay short; read timeouts follow what each endpoint does
+TIMEOUTS = {
+    "upload": httpx.Timeout(60.0, connect=5.0),     # base64 image bodies
+    "generate": httpx.Timeout(30.0, connect=5.0),   # returns once the job is queued
+    "share": httpx.Timeout(10.0, connect=5.0),
+    "status": httpx.Timeout(10.0, connect=5.0),
+    "download": httpx.Timeout(120.0, connect=5.0),  # .glb previews can be large
+}
+
+# Generation parameters, also part of the prompt cache key (see prompt_cache.py)
+IMAGE_SETTINGS = {
+    "seeds": [-1],
+    "resolution": 1024,
+    "diffusion": {
+        "adherence": 2,
+        "denoising": 1,
+        "model": "generio-v1-sfw",
+        "steps": 6
+    },
+    "alpha": {"active": False, "fill": {"active": False, "margin": 10}},
+}
+
+MODEL_SETTINGS = {
+    "seeds": [-1],
+    "quality": "high",
+    "keep_ratio": 0.95,
+    "geometry_adherence": 7.5,
+    "material_adherence": 3,
+    "material_active": True,
+}
+
+
+def upload_body(image_bytes: bytes):
+    """
+    POST /assets JSON body as (length, async chunks): the base64 data URL is
+    encoded piece by piece while sending, never held as one string.
+    """
+    head, tail = json.dumps({
+        "app": "library",
+        "file_key": "default",
+        "file_data": "data:image/png;base64,FILE_DATA",
+        "file_process": {"mode": "limit", "resolution": 1024},
+        "shared": 0
+    }).encode("utf-8").split(b"FILE_DATA")
+    length = len(head) + 4 * ((len(image_bytes) + 2) // 3) + len(tail)
+
+    async def chunks():
+        yield head
+        view = memoryview(image_bytes)
+        for start in range(0, len(view), UPLOAD_CHUNK):
+            yield base64.b64encode(view[start:start + UPLOAD_CHUNK])
+        yield tail
+
+    return length, chunks()
+
+
+class GenerioClient:
+    def __init__(self, api_base: str = API_BASE, token: str = AUTH_TOKEN,
+                 max_concurrency: int = MAX_CONCURRENCY, max_keepalive: int = MAX_KEEPALIVE):
+        self.api_base = api_base
+        self.http = httpx.AsyncClient(
+            base_url=api_base,
+            headers={"Authorization": f"Bearer {token}", "x-execution-mode": "automatic"},
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_keepalive),
+            timeout=TIMEOUTS["generate"],
+        )
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.uploads = OrderedDict()  # image sha256 -> asset id, least recently used first
+        self.uploading = {}
+        self.upload_hits = 0
+        self.upload_misses = 0
+        self.upload_joined = 0
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def request(self, method: str, path: str, timeout: str, check: bool = True, **kwargs) -> httpx.Response:
+        async with self.slots:
+            response = await self.http.request(method, path, timeout=TIMEOUTS[timeout], **kwargs)
+        if check:
+            response.raise_for_status()
+        return response
+
+    # --- Assets ---
+    async def upload_asset(self, image_bytes: bytes) -> str:
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        asset_id = self.uploads.get(digest)
+        if asset_id is not None:
+            self.upload_hits += 1
+            self.uploads.move_to_end(digest)
+            return asset_id
+
+        # Concurrent uploads of the same image share one request
+        upload = self.uploading.get(digest)
+        if upload is not None:
+            self.upload_joined += 1
+        else:
+            self.upload_misses += 1
+            upload = asyncio.ensure_future(self.send_upload(digest, image_bytes))
+            self.uploading[digest] = upload
+            upload.add_done_callback(lambda _: self.uploading.pop(digest, None))
+        return await asyncio.shield(upload)
+
+    async def send_upload(self, digest: str, image_bytes: bytes) -> str:
+        length, chunks = upload_body(image_bytes)
+        response = await self.request("POST", "/assets", "upload", content=chunks, headers={
+            "Content-Type": "application/json",
+            "Content-Length": str(length)
+        })
+        asset_id = response.json()["assets"][0]["id"]
+
+        self.uploads[digest] = asset_id
+        while len(self.uploads) > UPLOAD_CACHE_SIZE:
+            self.uploads.popitem(last=False)
+        return asset_id
+
+    def summary(self) -> dict:
+        return {"uploads": len(self.uploads), "hits": self.upload_hits, "misses": self.upload_misses,
+                "joined": self.upload_joined}
+
+    async def share_asset(self, asset_id: str):
+        # Best effort, like before: a failed share only means no public preview URL
+        await self.request("PUT", f"/assets/{asset_id}/shared", "share", check=False, json={"shared": 1})
+
+    async def asset_status(self, asset_id: str) -> str:
+        response = await self.request("GET", f"/assets/{asset_id}/files/default/status", "status")
+        return response.json().get("status", "unknown")
+
+    def shared_url(self, asset_id: str, file_name: str) -> str:
+        return f"{self.api_base}/assets/{asset_id}/shared/files/default/{file_name}"
+
+    @asynccontextmanager
+    async def stream_shared(self, asset_id: str, file_name: str):
+        """ The shared file as a response whose body is read in chunks with aiter_bytes() """
+        async with self.slots:
+            async with self.http.stream("GET", f"/assets/{asset_id}/shared/files/default/{file_name}",
+                                        timeout=TIMEOUTS["download"]) as response:
+                response.raise_for_status()
+                yield response
+
+    # --- Generation ---
+    async def generate_image(self, prompt: str) -> str:
+        response = await self.request("POST", "/images/from-prompt", "generate", json={
+            "app": "generio-ui-dev",
+            "prompt_positive": prompt,
+            **IMAGE_SETTINGS,
+            "additional": {}
+        })
+        return response.json()["assets"][0]["id"]
+
+    async def generate_model(self, prompt: str) -> str:
+        response = await self.request("POST", "/models/from-prompt", "generate", json={
+            "app": "generio-ui-dev",
+            "prompt_positive": prompt,
+            **MODEL_SETTINGS,
+            "texture_active": True,
+            "additional": {}
+        })
+        return response.json()["assets"][0]["id"]
+
+    async def generate_model_from_asset(self, asset_id: str, prompt: str = "") -> str:
+        payload = {
+            "app": "sketch",
+            "assets": [{"id": asset_id, "file_key": "default"}],
+            **MODEL_SETTINGS,
+            "additional": {}
+        }
+        if prompt:
+            payload["prompt_positive"] = prompt
+
+        response = await self.request("POST", "/models/from-assets", "generate", json=payload)
+        return response.json()["assets"][0]["id"]
@@ -0,0 +1,128 @@
+"""
+On-disk LRU cache for finished .glb previews
+
+A finished asset never changes, so /proxy-glb downloads each model from
+Generio once, streaming it to disk in chunks, and serves every later request
+from the file (FileResponse handles ETag and Range). Concurrent requests for
+an asset that is not cached yet share one download. The cache directory is
+kept under GLB_CACHE_MAX_BYTES by dropping the least recently served files.
+"""
+import asyncio
+import os
+import re
+import uuid
+from collections import Counter, OrderedDict
+
+GLB_CACHE_DIR = os.getenv("GLB_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "glb"))
+GLB_CACHE_MAX_BYTES = int(os.getenv("GLB_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# Asset ids end up in file names, anything else is rejected
+ASSET_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+class GlbCache:
+    def __init__(self, generio, directory: str = GLB_CACHE_DIR, max_bytes: int = GLB_CACHE_MAX_BYTES):
+        self.generio = generio
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.files = OrderedDict()  # asset id -> size, least recently served first
+        self.downloads = {}
+        self.serving = Counter()  # asset id -> responses still reading the file, never evicted
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0  # misses that waited on a download already running
+
+        os.makedirs(directory, exist_ok=True)
+        # Pick up what earlier runs left, oldest access first
+        entries = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(".part"):
+                os.remove(path)
+            elif name.endswith(".glb"):
+                stat = os.stat(path)
+                entries.append((stat.st_atime, name[:-len(".glb")], stat.st_size))
+        for _, asset_id, size in sorted(entries):
+            self.files[asset_id] = size
+
+    def path(self, asset_id: str) -> str:
+        return os.path.join(self.directory, f"{asset_id}.glb")
+
+    @property
+    def size(self) -> int:
+        return sum(self.files.values())
+
+    def summary(self) -> dict:
+        return {"files": len(self.files), "bytes": self.size,
+                "hits": self.hits, "misses": self.misses, "joined": self.joined,
+                "serving": sum(self.serving.values())}
+
+    async def fetch(self, asset_id: str) -> str:
+        """
+        Path of the cached preview.glb of `asset_id`, downloaded first if needed.
+        The file is pinned against eviction until release(asset_id) is called.
+        """
+        if not ASSET_ID.match(asset_id):
+            raise ValueError(f"Invalid asset id: {asset_id!r}")
+
+        counted = False
+        while True:
+            if asset_id in self.files and os.path.exists(self.path(asset_id)):
+                self.hits += not counted
+                self.files.move_to_end(asset_id)
+                self.serving[asset_id] += 1
+                return self.path(asset_id)
+
+            download = self.downloads.get(asset_id)
+            if download is None:
+                self.misses += not counted
+                download = asyncio.ensure_future(self.download(asset_id))
+                self.downloads[asset_id] = download
+                download.add_done_callback(lambda _: self.downloads.pop(asset_id, None))
+            else:
+                self.joined += not counted
+            counted = True
+            # Shielded so a client hanging up does not cancel the download others wait on.
+            # Checked again afterwards: another download may have evicted the file meanwhile
+            await asyncio.shield(download)
+
+    def release(self, asset_id: str):
+        self.serving[asset_id] -= 1
+        if self.serving[asset_id] <= 0:
+            del self.serving[asset_id]
+            # Files skipped while pinned may have left the cache over budget
+            self.evict(keep=None)
+
+    async def download(self, asset_id: str) -> str:
+        path = self.path(asset_id)
+        part = f"{path}.{uuid.uuid4().hex}.part"
+        size = 0
+        try:
+            with open(part, "wb") as f:
+                async with self.generio.stream_shared(asset_id, "preview.glb") as response:
+                    async for chunk in response.aiter_bytes():
+                        f.write(chunk)
+                        size += len(chunk)
+            os.replace(part, path)
+        except BaseException:
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+
+        self.files[asset_id] = size
+        self.files.move_to_end(asset_id)
+        self.evict(keep=asset_id)
+        return path
+
+    def evict(self, keep=None):
+        total = self.size
+        for asset_id in list(self.files):
+            if total <= self.max_bytes:
+                break
+            if asset_id == keep or asset_id in self.serving:
+                continue
+            total -= self.files.pop(asset_id)
+            try:
+                os.remove(self.path(asset_id))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,199 @@
+"""
+Generation job table
+
+POST /generate/* registers a job and returns its id right away; the Generio
+calls that start the generation run in the background. One poller task then
+checks the status of every pending asset in rounds, backing off per job, so
+upstream status traffic grows with the number of jobs and not with the number
+of clients waiting on them. Clients wait through long-polling or SSE.
+"""
+import asyncio
+import time
+import uuid
+
+# Status polling backoff per job: first check after POLL_INITIAL s, then x POLL_FACTOR up to POLL_MAX
+POLL_INITIAL = 1.0
+POLL_FACTOR = 1.5
+POLL_MAX = 15.0
+# Status requests in flight at once during one polling round
+POLL_BATCH = 32
+# Give up on assets that are not ready by then, forget finished jobs after JOB_TTL
+JOB_TIMEOUT = 15 * 60
+JOB_TTL = 60 * 60
+
+FINISHED = ("ready", "failed")
+
+
+class Job:
+    def __init__(self, kind: str, file_name: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.file_name = file_name
+        self.status = "submitting"
+        self.asset_id = None
+        self.url = None
+        self.error = None
+        self.created = time.time()
+        self.finished_at = None
+        self.interval = POLL_INITIAL
+        self.next_poll = 0.0
+        self.polls = 0
+        self.changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def update(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+        if self.finished and self.finished_at is None:
+            self.finished_at = time.time()
+        # Wake everyone waiting on this version, later waiters get a fresh event
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def snapshot(self) -> dict:
+        return {
+            "success": self.status != "failed",
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "id": self.asset_id,
+            "url": self.url,
+            "error": self.error,
+        }
+
+
+class JobTable:
+    def __init__(self, generio):
+        self.generio = generio
+        self.jobs = {}
+        self.tasks = set()
+        self.poller = None
+        self.wakeup = asyncio.Event()
+        self.status_requests = 0
+
+    # --- Lifecycle ---
+    def start(self):
+        self.poller = asyncio.create_task(self.poll_forever())
+
+    async def stop(self):
+        for task in [self.poller, *self.tasks]:
+            if task:
+                task.cancel()
+        await asyncio.gather(*[task for task in [self.poller, *self.tasks] if task], return_exceptions=True)
+
+    # --- Jobs ---
+    def submit(self, kind: str, file_name: str, start) -> Job:
+        """
+        Register a job and run `start` (a coroutine returning the Generio asset id)
+        in the background; the job is pending from then until the asset is ready.
+        """
+        job = Job(kind, file_name)
+        self.jobs[job.id] = job
+        task = asyncio.create_task(self.run_start(job, start))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return job
+
+    def add_ready(self, kind: str, asset_id: str, url: str) -> Job:
+        """ A job that is done from the start, e.g. in mock mode """
+        job = Job(kind, "")
+        job.update(status="ready", asset_id=asset_id, url=url)
+        self.jobs[job.id] = job
+        return job
+
+    async def run_start(self, job: Job, start):
+        try:
+            asset_id = await start
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+            return
+        job.update(status="pending", asset_id=asset_id, url=self.generio.shared_url(asset_id, job.file_name),
+                   next_poll=time.monotonic() + job.interval)
+        self.wakeup.set()
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    def summary(self) -> dict:
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"jobs": counts, "status_requests": self.status_requests}
+
+    async def wait(self, job: Job, timeout: float) -> dict:
+        """ Long-poll: the job once it is finished, or as it is after `timeout` seconds """
+        deadline = time.monotonic() + timeout
+        while not job.finished:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(job.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return job.snapshot()
+
+    async def changes(self, job: Job, keepalive: float = 15.0):
+        """ Snapshot now and after every change until the job is finished; None while idle """
+        changed = job.changed
+        yield job.snapshot()
+        while not job.finished:
+            try:
+                await asyncio.wait_for(changed.wait(), keepalive)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            changed = job.changed
+            yield job.snapshot()
+
+    # --- Polling ---
+    async def poll_job(self, job: Job):
+        self.status_requests += 1
+        job.polls += 1
+        try:
+            status = await self.generio.asset_status(job.asset_id)
+        except Exception as e:
+            # Transient errors count as "not yet", the timeout ends hopeless jobs
+            status, job.error = "pending", str(e)
+
+        if status == "ready":
+            job.update(status="ready", error=None)
+        elif status in ("failed", "error"):
+            job.update(status="failed", error=f"Generation {status}.")
+        elif time.time() - job.created > JOB_TIMEOUT:
+            job.update(status="failed", error="Timed out waiting for the asset.")
+        else:
+            job.interval = min(job.interval * POLL_FACTOR, POLL_MAX)
+            job.next_poll = time.monotonic() + job.interval
+
+    async def poll_round(self) -> float:
+        """ Poll every job that is due and drop expired ones; returns the seconds until the next of either """
+        now = time.monotonic()
+        pending = [job for job in self.jobs.values() if job.status == "pending"]
+        due = [job for job in pending if job.next_poll <= now]
+        for start in range(0, len(due), POLL_BATCH):
+            await asyncio.gather(*[self.poll_job(job) for job in due[start:start + POLL_BATCH]])
+
+        cutoff = time.time() - JOB_TTL
+        for job_id in [job.id for job in self.jobs.values() if job.finished and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+        delays = [job.next_poll - time.monotonic() for job in self.jobs.values() if job.status == "pending"]
+        delays += [job.finished_at + JOB_TTL - time.time() for job in self.jobs.values() if job.finished]
+        # With nothing to do, still come back every JOB_TTL: jobs added ready (mock mode,
+        # prompt cache hits) never wake the poller, but have to expire too
+        return max(min(delays, default=JOB_TTL), 0.05)
+
+    async def poll_forever(self):
+        while True:
+            # Cleared before the round, so a job submitted meanwhile still wakes the next sleep
+            self.wakeup.clear()
+            delay = await self.poll_round()
+            try:
+                # Sleep until the next job is due or expires, or a new one is submitted
+                await asyncio.wait_for(self.wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
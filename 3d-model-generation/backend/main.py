@@ -1,21 +1,40 @@
+import json
 import os
-import base64
-import requests
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, UploadFile, File, Form
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+
+from generio_client import IMAGE_SETTINGS, MODEL_SETTINGS, GenerioClient
+from glb_cache import GlbCache
+from jobs import JobTable
+from prompt_cache import PromptCache, prompt_key
 
 load_dotenv()
 
 USE_MOCK = os.getenv("USE_MOCK", "true").lower() == "true"
-AUTH_TOKEN = os.getenv("AUTH_TOKEN")
-API_BASE = "https://test-api.generio.ai"
-HEADERS = {
-    "Authorization": f"Bearer {AUTH_TOKEN}",
-    "x-execution-mode": "automatic"
-}
 
-app = FastAPI()
+# Longest a GET /jobs/{id}?wait=... request is held open
+MAX_WAIT = 30.0
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for the whole process, see generio_client.py
+    app.state.generio = GenerioClient()
+    # Generations run as jobs, one poller checks their status, see jobs.py
+    app.state.jobs = JobTable(app.state.generio)
+    app.state.jobs.start()
+    # Identical prompts share one generation, see prompt_cache.py
+    app.state.prompts = PromptCache()
+    # Finished previews are served from disk, see glb_cache.py
+    app.state.glb_cache = GlbCache(app.state.generio)
+    yield
+    await app.state.jobs.stop()
+    await app.state.generio.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/")
@@ -28,57 +47,6 @@ def test():
     return {"success": True}
 
 
-# --- Shared Utility Functions ---
-def upload_asset(image_bytes: bytes) -> str:
-    b64_img = base64.b64encode(image_bytes).decode("utf-8")
-    data_url = f"data:image/png;base64,{b64_img}"
-    response = requests.post(
-        f"{API_BASE}/assets",
-        headers=HEADERS,
-        json={
-            "app": "library",
-            "file_key": "default",
-            "file_data": data_url,
-            "file_process": {"mode": "limit", "resolution": 1024},
-            "shared": 0
-        }
-    )
-    response.raise_for_status()
-    return response.json()["assets"][0]["id"]
-
-
-def generate_model_from_asset(asset_id: str, prompt: str = "") -> str:
-    payload = {
-        "app": "sketch",
-        "assets": [{"id": asset_id, "file_key": "default"}],
-        "seeds": [-1],
-        "quality": "high",
-        "keep_ratio": 0.95,
-        "geometry_adherence": 7.5,
-        "material_adherence": 3,
-        "material_active": True,
-        "additional": {}
-    }
-    if prompt:
-        payload["prompt_positive"] = prompt
-
-    response = requests.post(
-        f"{API_BASE}/models/from-assets",
-        headers=HEADERS,
-        json=payload
-    )
-    response.raise_for_status()
-    return response.json()["assets"][0]["id"]
-
-
-def share_asset(asset_id: str):
-    requests.put(
-        f"{API_BASE}/assets/{asset_id}/shared",
-        headers=HEADERS,
-        json={"shared": 1}
-    )
-
-
 # --- Routes ---
 @app.post("/generate/text-to-image")
 async def text_to_image(request: Request):
@@ -88,44 +56,19 @@ async def text_to_image(request: Request):
     if not prompt:
         return {"success": False, "error": "Prompt is required"}
 
+    jobs = app.state.jobs
     if USE_MOCK:
-        return {
-            "success": True,
-            "source": "url",
-            "id": "mock-image-id",
-            "url": f"https://via.placeholder.com/512x512.png?text={prompt.replace(' ', '+')}"
-        }
+        return jobs.add_ready("image", "mock-image-id",
+                              f"https://via.placeholder.com/512x512.png?text={prompt.replace(' ', '+')}").snapshot()
 
-    try:
-        response = requests.post(
-            f"{API_BASE}/images/from-prompt",
-            headers=HEADERS,
-            json={
-                "app": "generio-ui-dev",
-                "prompt_positive": prompt,
-                "seeds": [-1],
-                "resolution": 1024,
-                "diffusion": {
-                    "adherence": 2,
-                    "denoising": 1,
-                    "model": "generio-v1-sfw",
-                    "steps": 6
-                },
-                "alpha": {"active": False, "fill": {"active": False, "margin": 10}},
-                "additional": {}
-            }
-        )
-        response.raise_for_status()
-        asset_id = response.json()["assets"][0]["id"]
-        share_asset(asset_id)
-        return {
-            "success": True,
-            "source": "shared-url",
-            "id": asset_id,
-            "url": f"{API_BASE}/assets/{asset_id}/shared/files/default/preview.png"
-        }
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    async def start():
+        generio = app.state.generio
+        asset_id = await generio.generate_image(prompt)
+        await generio.share_asset(asset_id)
+        return asset_id
+
+    key = prompt_key("image", prompt, IMAGE_SETTINGS)
+    return app.state.prompts.submit(jobs, key, "image", "preview.png", start).snapshot()
 
 
 @app.post("/generate/text-to-model")
@@ -136,55 +79,39 @@ async def text_to_model(request: Request):
     if not prompt:
         return {"success": False, "error": "Prompt is required."}
 
+    jobs = app.state.jobs
     if USE_MOCK:
-        return {
-            "success": True,
-            "id": "mock-model-id",
-            "url": f"https://via.placeholder.com/512x512.png?text=Model+{prompt.replace(' ', '+')}"
-        }
+        return jobs.add_ready("model", "mock-model-id",
+                              f"https://via.placeholder.com/512x512.png?text=Model+{prompt.replace(' ', '+')}").snapshot()
 
-    try:
-        response = requests.post(
-            f"{API_BASE}/models/from-prompt",
-            headers=HEADERS,
-            json={
-                "app": "generio-ui-dev",
-                "prompt_positive": prompt,
-                "seeds": [-1],
-                "quality": "high",
-                "keep_ratio": 0.95,
-                "geometry_adherence": 7.5,
-                "material_adherence": 3,
-                "material_active": True,
-                "texture_active": True,
-                "additional": {}
-            }
-        )
-        response.raise_for_status()
-        asset_id = response.json()["assets"][0]["id"]
-        share_asset(asset_id)
-        return {"success": True, "id": asset_id}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    async def start():
+        generio = app.state.generio
+        asset_id = await generio.generate_model(prompt)
+        await generio.share_asset(asset_id)
+        return asset_id
+
+    key = prompt_key("model", prompt, MODEL_SETTINGS)
+    return app.state.prompts.submit(jobs, key, "model", "preview.glb", start).snapshot()
 
 
 @app.post("/generate/sketch-to-model")
 async def sketch_to_model(file: UploadFile = File(...), prompt: str = Form(None)):
+    jobs = app.state.jobs
     if USE_MOCK:
-        return {
-            "success": True,
-            "id": "mock-sketch-id",
-            "url": "https://via.placeholder.com/512x512.png?text=SketchModel"
-        }
+        return jobs.add_ready("model", "mock-sketch-id",
+                              "https://via.placeholder.com/512x512.png?text=SketchModel").snapshot()
 
-    try:
-        image_bytes = await file.read()
-        asset_id = upload_asset(image_bytes)
-        model_id = generate_model_from_asset(asset_id, prompt or "")
-        share_asset(model_id)
-        return {"success": True, "id": model_id}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    # Read now, the upload is closed once this request returns
+    image_bytes = await file.read()
+
+    async def start():
+        generio = app.state.generio
+        asset_id = await generio.upload_asset(image_bytes)
+        model_id = await generio.generate_model_from_asset(asset_id, prompt or "")
+        await generio.share_asset(model_id)
+        return model_id
+
+    return jobs.submit("model", "preview.glb", start()).snapshot()
 
 
 @app.post("/generate/image-to-model")
@@ -192,31 +119,95 @@ async def image_to_model(file: UploadFile = File(...), prompt: str = Form(None))
     return await sketch_to_model(file, prompt)
 
 
+# --- Jobs ---
+@app.get("/jobs")
+def jobs_summary():
+    return {"success": True, **app.state.jobs.summary()}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0.0):
+    # With ?wait=N the request is held until the job is finished or N seconds pass
+    job = app.state.jobs.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"success": False, "error": "Unknown job."})
+    return await app.state.jobs.wait(job, min(max(wait, 0.0), MAX_WAIT))
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    # Server-sent events: one `data:` line per status change, comments as keepalive
+    job = app.state.jobs.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"success": False, "error": "Unknown job."})
+
+    async def events():
+        async for snapshot in app.state.jobs.changes(job):
+            yield ": keepalive\n\n" if snapshot is None else f"data: {json.dumps(snapshot)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+class CachedGlbResponse(FileResponse):
+    """ FileResponse that unpins its cache file once sent, or once the client hangs up """
+
+    def __init__(self, asset_id: str, path: str, **kwargs):
+        super().__init__(path, **kwargs)
+        self.asset_id = asset_id
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            app.state.glb_cache.release(self.asset_id)
+
+
 @app.get("/proxy-glb/{asset_id}")
-def proxy_glb(asset_id: str):
+async def proxy_glb(asset_id: str, request: Request):
     try:
-        url = f"{API_BASE}/assets/{asset_id}/shared/files/default/preview.glb"
-        resp = requests.get(url)
-        resp.raise_for_status()
-        return Response(
-            content=resp.content,
-            media_type="model/gltf-binary",
-            headers={
-                "Content-Disposition": f'inline; filename="{asset_id}.glb"',
-                "Access-Control-Allow-Origin": "*"
-            }
-        )
+        path = await app.state.glb_cache.fetch(asset_id)
+    except ValueError as e:
+        return Response(content=str(e), media_type="application/json", status_code=400)
     except Exception as e:
         return Response(content=str(e), media_type="application/json", status_code=502)
 
+    # fetch() pinned the file against eviction, the response unpins it
+    # A finished asset never changes, so its id and size make a strong validator
+    etag = f'"{asset_id}-{os.path.getsize(path)}"'
+    if etag in request.headers.get("if-none-match", ""):
+        app.state.glb_cache.release(asset_id)
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # FileResponse streams the file in chunks and answers Range requests
+    return CachedGlbResponse(
+        asset_id,
+        path,
+        media_type="model/gltf-binary",
+        content_disposition_type="inline",
+        filename=f"{asset_id}.glb",
+        headers={
+            "Access-Control-Allow-Origin": "*",
+            "ETag": etag,
+            "Cache-Control": "public, max-age=31536000, immutable"
+        }
+    )
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "success": True,
+        "jobs": app.state.jobs.summary(),
+        "uploads": app.state.generio.summary(),
+        "prompt_cache": app.state.prompts.summary(),
+        "glb_cache": app.state.glb_cache.summary()
+    }
+
 
 @app.get("/status/{asset_id}")
-def get_status(asset_id: str):
+async def get_status(asset_id: str):
     try:
-        url = f"{API_BASE}/assets/{asset_id}/files/default/status"
-        resp = requests.get(url, headers=HEADERS)
-        resp.raise_for_status()
-        status = resp.json().get("status", "unknown")
+        status = await app.state.generio.asset_status(asset_id)
         return JSONResponse(
             status_code=200 if status == "ready" else 425 if status == "pending" else 202,
             content={"success": status == "ready", "status": status}
@@ -0,0 +1,75 @@
+"""
+Prompt result cache
+
+Users resubmit the same prompts all the time, and every generation is slow
+and billed. Jobs are remembered by normalized prompt plus the generation
+settings: a prompt whose job is still running joins that job, one whose job
+finished within PROMPT_CACHE_TTL gets its asset right away. Failed jobs are
+forgotten so the next request tries again.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+PROMPT_CACHE_TTL = float(os.getenv("PROMPT_CACHE_TTL", str(24 * 60 * 60)))
+PROMPT_CACHE_SIZE = int(os.getenv("PROMPT_CACHE_SIZE", "1024"))
+
+
+def normalize_prompt(prompt: str) -> str:
+    # Case and spacing do not change what gets generated
+    return " ".join(prompt.casefold().split())
+
+
+def prompt_key(kind: str, prompt: str, settings: dict) -> str:
+    key = json.dumps([kind, normalize_prompt(prompt), settings], sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    def __init__(self, ttl: float = PROMPT_CACHE_TTL, max_entries: int = PROMPT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (job, stored at), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0  # requests that joined a job still running
+
+    def summary(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses, "joined": self.joined}
+
+    def lookup(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        job, stored = entry
+        if job.status == "failed" or time.time() - stored > self.ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return job
+
+    def store(self, key: str, job):
+        self.entries[key] = (job, time.time())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def submit(self, jobs, key: str, kind: str, file_name: str, start):
+        """
+        The job for `key`: the running one, a new ready one for a cached asset,
+        or jobs.submit(kind, file_name, start()) on a miss.
+        """
+        job = self.lookup(key)
+        if job is None:
+            self.misses += 1
+            job = jobs.submit(kind, file_name, start())
+            self.store(key, job)
+            return job
+        if not job.finished:
+            self.joined += 1
+            return job
+        self.hits += 1
+        # A fresh job id, the original one may have been dropped from the job table already
+        return jobs.add_ready(job.kind, job.asset_id, job.url)
@@ -1,6 +1,6 @@
 import streamlit as st
 import requests
-import time
+from utils.jobs import wait_for_job
 
 st.set_page_config(page_title="GenerIO UI", layout="centered")
 st.title("🧠 Project GenerIO")
@@ -12,33 +12,30 @@ def display_image(result):
         st.error(f"Backend error: {result.get('error', 'Unknown error')}")
         return
 
-    source = result.get("source")
-    url = result.get("url")
+    # The backend answers with a job right away, wait for it before fetching the image
+    result = wait_for_job(result)
+    if result["status"] == "failed":
+        st.error(f"Backend error: {result.get('error') or 'Unknown error'}")
+        return
 
-    if source == "base64":
-        st.warning("Base64 not currently supported.")
+    url = result.get("url")
+    if not url:
+        st.warning("No image URL provided.")
         return
 
-    elif source in ["url", "shared-url"]:
-        if url:
-            st.markdown(f"**🔗 [Open Image in New Tab]({url})**", unsafe_allow_html=True)
-
-            for i in range(5):
-                try:
-                    resp = requests.get(url)
-                    if resp.status_code == 200 and resp.headers["Content-Type"].startswith("image"):
-                        st.image(resp.content, caption="Generated Image", width=512)
-                        return
-                except:
-                    pass
-                time.sleep(2)
-
-            st.warning("The image is still being processed. Try again shortly.")
-        else:
-            st.warning("No image URL provided.")
-    else:
-        st.warning("Unknown image source format.")
+    st.markdown(f"**🔗 [Open Image in New Tab]({url})**", unsafe_allow_html=True)
+    if result["status"] != "ready":
+        st.warning("The image is still being processed. Try again shortly.")
+        return
 
+    try:
+        resp = requests.get(url)
+        if resp.status_code == 200 and resp.headers["Content-Type"].startswith("image"):
+            st.image(resp.content, caption="Generated Image", width=512)
+            return
+    except requests.RequestException:
+        pass
+    st.warning("The image could not be loaded. Try the link above.")
 
 prompt = st.text_input("Enter a prompt to generate an image:")
 
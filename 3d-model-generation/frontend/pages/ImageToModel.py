@@ -1,10 +1,10 @@
 import streamlit as st
 import requests
-import time
 import numpy as np
 from PIL import Image
 import cv2
 import io
+from utils.jobs import wait_for_job
 from utils.viewer import render_glb_viewer
 
 st.set_page_config(page_title="Image to Model", layout="centered")
@@ -12,19 +12,6 @@ st.title("🖼️ Image to 3D Model")
 st.write("Upload an image and turn it into a 3D model (.glb).")
 
 
-def wait_for_asset_ready(asset_id: str, max_retries=20, delay=3) -> bool:
-    status_url = f"http://localhost:8000/status/{asset_id}"
-    for _ in range(max_retries):
-        try:
-            response = requests.get(status_url)
-            if response.status_code == 200 and response.json().get("status") == "ready":
-                return True
-        except Exception:
-            pass
-        time.sleep(delay)
-    return False
-
-
 def convert_to_sketch(image: Image.Image) -> Image.Image:
     img = np.array(image.convert("RGB"))
     img_gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
@@ -66,16 +53,18 @@ if st.button("Generate 3D Model"):
                     st.error(f"Backend error ({response.status_code}): {response.text}")
                 else:
                     result = response.json()
-                    if result.get("success") and result.get("id"):
-                        model_id = result["id"]
+                    if result.get("success") and result.get("job_id"):
                         st.info("Waiting for the model to be ready...")
 
-                        if wait_for_asset_ready(model_id):
-                            model_url = f"https://test-api.generio.ai/assets/{model_id}/shared/files/default/preview.glb"
+                        result = wait_for_job(result)
+                        if result["status"] == "ready":
+                            model_id, model_url = result["id"], result["url"]
                             st.success("✅ 3D Model is ready!")
                             st.markdown(f"[🔗 Download .glb model]({model_url})", unsafe_allow_html=True)
                             st.subheader("🧩 3D Model Preview:")
                             render_glb_viewer(model_id)
+                        elif result["status"] == "failed":
+                            st.error(result.get("error") or "Model generation failed.")
                         else:
                             st.warning("⚠️ Model is still processing. Please try again later.")
                     else:
@@ -1,10 +1,10 @@
 import streamlit as st
 import requests
-import time
 import io
 import numpy as np
 from PIL import Image
 from streamlit_drawable_canvas import st_canvas
+from utils.jobs import wait_for_job
 from utils.viewer import *
 
 st.set_page_config(page_title="Sketch to Model", layout="centered")
@@ -32,23 +32,6 @@ def is_canvas_empty(image_data):
     return np.all(grayscale == 255)
 
 
-def wait_for_model_ready(asset_id: str, max_retries: int = 23, delay: int = 3) -> bool:
-    url = f"http://localhost:8000/status/{asset_id}"
-    for _ in range(max_retries):
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                return True
-            elif response.status_code == 425:
-                time.sleep(delay)
-                continue
-            else:
-                return False
-        except requests.RequestException:
-            time.sleep(delay)
-    return False
-
-
 prompt = st.text_input("✏️ Describe your sketch (optional)", placeholder="e.g. A simple cube")
 
 if st.button("Generate Model"):
@@ -75,16 +58,18 @@ if st.button("Generate Model"):
                     st.error(f"Backend error: {response.status_code}")
                 else:
                     data = response.json()
-                    if data.get("success") and data.get("id"):
-                        asset_id = data["id"]
+                    if data.get("success") and data.get("job_id"):
                         st.info("Waiting for model preview to be ready...")
 
-                        if wait_for_model_ready(asset_id):
-                            model_url = f"https://test-api.generio.ai/assets/{asset_id}/shared/files/default/preview.glb"
+                        data = wait_for_job(data)
+                        if data["status"] == "ready":
+                            asset_id, model_url = data["id"], data["url"]
                             st.success("Model is ready!")
                             st.markdown(f"[📦 Download .glb]({model_url})", unsafe_allow_html=True)
                             st.subheader("🧩 3D Model Preview:")
                             render_glb_viewer(asset_id)
+                        elif data["status"] == "failed":
+                            st.error(data.get("error") or "Model generation failed.")
                         else:
                             st.warning("Model not ready yet. Try again shortly.")
                     else:
@@ -1,23 +1,12 @@
 import streamlit as st
 import requests
-import time
+from utils.jobs import wait_for_job
 from utils.viewer import *
 
 st.title("🔷 3D Model Generator")
 st.write("Enter a prompt to generate a 3D model (.glb format).")
 
 
-def wait_for_model_ready(asset_id: str, max_retries: int = 20, delay: int = 3) -> bool:
-    for _ in range(max_retries):
-        status_resp = requests.get(f"http://localhost:8000/status/{asset_id}")
-        if status_resp.status_code == 200:
-            status_data = status_resp.json()
-            if status_data.get("status") == "ready":
-                return True
-        time.sleep(delay)
-    return False
-
-
 prompt = st.text_input("Model Prompt")
 
 if st.button("Generate Model"):
@@ -34,17 +23,18 @@ if st.button("Generate Model"):
                     st.error(f"Error from backend: {response.status_code}")
                 else:
                     data = response.json()
-                    if data.get("success") and data.get("id"):
-                        asset_id = data["id"]
-
+                    if data.get("success") and data.get("job_id"):
                         st.info("Waiting for model preview to be ready...")
 
-                        if wait_for_model_ready(asset_id):
-                            model_url = f"https://test-api.generio.ai/assets/{asset_id}/shared/files/default/preview.glb"
+                        data = wait_for_job(data)
+                        if data["status"] == "ready":
+                            asset_id, model_url = data["id"], data["url"]
                             st.success("Model is ready!")
                             st.markdown(f"[🔗 Download .glb Model]({model_url})", unsafe_allow_html=True)
                             st.subheader("🧩 3D Model Preview:")
                             render_glb_viewer(asset_id)
+                        elif data["status"] == "failed":
+                            st.error(data.get("error") or "Model generation failed.")
                         else:
                             st.warning("Model preview not ready. Try again later.")
                     else:
@@ -0,0 +1,37 @@
+import time
+
+import requests
+
+BACKEND_URL = "http://localhost:8000"
+
+# Backoff between retries when the backend cannot be reached, and when to give up
+RETRY_DELAY = 1.0
+RETRY_MAX_DELAY = 10.0
+MAX_ERRORS = 5
+
+
+def wait_for_job(job: dict, timeout: float = 300, wait: int = 25) -> dict:
+    """
+    Long-poll the backend until the job is ready or failed, or `timeout` seconds pass.
+    Each request is held by the server for up to `wait` seconds, so no sleeping here
+    unless the backend is unreachable. Returns the last job snapshot; check its "status".
+    """
+    deadline = time.monotonic() + timeout
+    errors, delay = 0, RETRY_DELAY
+    while job.get("status") not in ("ready", "failed") and time.monotonic() < deadline:
+        try:
+            response = requests.get(f"{BACKEND_URL}/jobs/{job['job_id']}", params={"wait": wait}, timeout=wait + 10)
+            if response.status_code == 404:
+                return {**job, "status": "failed", "error": "The backend no longer knows this job."}
+            response.raise_for_status()
+            job = response.json()
+        except (requests.RequestException, ValueError) as e:
+            # Backend down or answering garbage: back off instead of hammering it
+            errors += 1
+            if errors >= MAX_ERRORS:
+                return {**job, "status": "failed", "error": f"Backend unreachable: {e}"}
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+            continue
+        errors, delay = 0, RETRY_DELAY
+    return job
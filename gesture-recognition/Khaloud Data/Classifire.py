@@ -1,42 +1,21 @@
-import pandas as pd
-import glob
-from sklearn.ensemble import RandomForestClassifier
-import joblib
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from training import train
+from utils.instrumentation import Instrumentation
 
 # === Configurable Gesture Names ===
 gestures = ['Tornado', 'Slash', 'Avada Kedavra']
 
-# === Load Data ===
-X = []
-y = []
-
-print("Loading data...")
-
-for gesture in gestures:
-    csv_files = glob.glob(f"{gesture}/*.csv")
-    for file_path in csv_files:
-        print(f"Processing {file_path}...")
-        df = pd.read_csv(file_path, sep=';')
-
-        # Extract features: mean and std for each axis
-        features = [
-            df['accX'].mean(), df['accX'].std(),
-            df['accY'].mean(), df['accY'].std(),
-            df['accZ'].mean(), df['accZ'].std(),
-            df['gyroX'].mean(), df['gyroX'].std(),
-            df['gyroY'].mean(), df['gyroY'].std(),
-            df['gyroZ'].mean(), df['gyroZ'].std()
-        ]
-
-        X.append(features)
-        y.append(gesture)
-
-print("Training model...")
-
-# === Train the Model ===
-clf = RandomForestClassifier(n_estimators=100, random_state=42)
-clf.fit(X, y)
-
-# === Save the Model ===
-joblib.dump(clf, 'gesture_model.pkl')
-print("Model trained and saved as gesture_model.pkl")
+# === Augmentation ===
+# Augmented variants added per recording (0 = off), see utils/augmentation.py
+AUGMENT_COPIES = 0
+
+# Same as `python -m training train --dataset spells`, see training/pipeline.py
+if __name__ == '__main__':
+    # Stage timings end up in runs/Classifire.jsonl, see utils/instrumentation.py
+    run = Instrumentation('Classifire')
+    train('spells', gestures, augment_copies=AUGMENT_COPIES,
+          output_dir=os.path.dirname(os.path.abspath(__file__)), run=run)
+    run.finish()
@@ -1,35 +1,19 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import glob
 import os
+import sys
 
-directory = "C:/Users/Admin/PycharmProjects/group-c/project-one/Khaloud Data/Tornado"
-csv_files = glob.glob(os.path.join(directory, "recording-*.csv"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.catalog import load_catalog
+from utils.plotting import render_recordings
 
-if not csv_files:
-    print("No CSV files found in the directory!")
-    exit()
+PLOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plots')
 
-for file_path in csv_files:
-    try:
-        df = pd.read_csv(file_path, delimiter=';')
-        file_name = os.path.basename(file_path)
+if __name__ == '__main__':
+    csv_files = load_catalog().paths('spells', ['Tornado'])
 
-        plt.figure(figsize=(10, 6))
+    if not csv_files:
+        print("No CSV files found in the directory!")
+        sys.exit()
 
-        if all(col in df.columns for col in ['accX', 'accY', 'accZ']):
-            plt.plot(df['accX'], label='X-axis')
-            plt.plot(df['accY'], label='Y-axis')
-            plt.plot(df['accZ'], label='Z-axis')
-
-            plt.title(f"Accelerometer Data: {file_name}")
-            plt.xlabel("Time Index")
-            plt.ylabel("Acceleration")
-            plt.legend()
-            plt.grid(True)
-            plt.tight_layout()
-            plt.show()
-
-    except Exception as e:
-        print(f"Error processing {file_path}: {str(e)}")
-        continue
\ No newline at end of file
+    # One image per recording, rendered headlessly in parallel
+    written = render_recordings(csv_files, PLOT_DIR)
+    print(f"{len(written)} recordings plotted to {os.path.join(PLOT_DIR, 'Tornado')}")
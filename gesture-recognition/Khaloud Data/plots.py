@@ -1,35 +1,14 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import os
+import sys
 
-# Load CSV and use semicolon separator
-df = pd.read_csv("Avada Kedavra/recording-20250506-171134.csv", sep=';')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.catalog import load_catalog
+from utils.plotting import render_recordings
 
+PLOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plots')
 
-# Convert time from ms to seconds
-df['time_s'] = df['time'] / 1000
-
-# Plot
-plt.figure(figsize=(12, 6))
-
-# Plot Accelerometer
-plt.subplot(2, 1, 1)
-plt.plot(df['time_s'], df['accX'], label='accX')
-plt.plot(df['time_s'], df['accY'], label='accY')
-plt.plot(df['time_s'], df['accZ'], label='accZ')
-plt.title('Accelerometer Data')
-plt.xlabel('Time (s)')
-plt.ylabel('Acceleration')
-plt.legend()
-
-# Plot Gyroscope
-plt.subplot(2, 1, 2)
-plt.plot(df['time_s'], df['gyroX'], label='gyroX')
-plt.plot(df['time_s'], df['gyroY'], label='gyroY')
-plt.plot(df['time_s'], df['gyroZ'], label='gyroZ')
-plt.title('Gyroscope Data')
-plt.xlabel('Time (s)')
-plt.ylabel('Rotation Rate')
-plt.legend()
-
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+if __name__ == '__main__':
+    # Accelerometer and gyroscope of a single Avada Kedavra recording, saved as an image
+    csv_files = load_catalog().paths('spells', ['Avada Kedavra'])[:1]
+    written = render_recordings(csv_files, PLOT_DIR, workers=1)
+    print(f"Plot saved as {written[0]}")
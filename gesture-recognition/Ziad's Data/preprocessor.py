@@ -1,60 +1,221 @@
+import numpy as np
 import pandas as pd
-import glob
+import io
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.catalog import DATA_ROOT, load_catalog
+from utils.features import AXES, quantize, working_dtype
+from utils.filters import moving_average
+from utils.instrumentation import Instrumentation
+from utils.manifest import file_fingerprint, is_unchanged, load_manifest, save_manifest
+from utils.resampling import resample
+from utils.store import store_exists, write_store
+from utils.validation import ISSUES, repair_recording, summarize, validate_files
 
 # === Configurable Person Names ===
 persons = ['Z', 'K']
 gestures = ['Rock', 'Paper', 'Scissors']
 
-
-# === Preprocessing Functions ===
-def smooth_data(series, window_size=5):
-    return series.rolling(window=window_size).mean().bfill()
+# === Paths & Parameters ===
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CLEANED_DIR = os.path.join(BASE_DIR, 'Cleaned')
+MANIFEST_PATH = os.path.join(CLEANED_DIR, '.manifest.json')
+STORE_DIR = os.path.join(CLEANED_DIR, 'store')
+VALIDATION_REPORT = os.path.join(CLEANED_DIR, 'validation_report.csv')
+
+WINDOW_SIZE = 5
+INTERVAL = 0.05
+# Bump whenever the cleaned output changes for the same parameters
+PIPELINE_VERSION = 3
+# Sample type from load to the cleaned CSVs and store: 'float64', 'float32' or 'int16'.
+# int16 keeps the sensors' own counts with fixed-point smoothing, see benchmarks/bench_quantized.py
+SAMPLE_DTYPE = 'float64'
+
+# === Validation ===
+# Recordings shorter than this (after repair) are left out of the cleaned data
+MIN_SAMPLES = 10
+# A longer pause between two samples is a gap, not jitter
+MAX_GAP_MS = 500
+# Drop duplicates, keep the longest gap-free stretch and interpolate saturated values
+REPAIR = True
 
 
-def interpolate_data(df, interval=0.05):
-    df['time_s'] = df['time'] / 1000
-    df.set_index('time_s', inplace=True)
-    df = df[~df.index.duplicated(keep='first')]
-
-    new_time_index = pd.RangeIndex(start=int(df.index.min() * 1000),
-                                   stop=int(df.index.max() * 1000),
-                                   step=int(interval * 1000)) / 1000
+# === Preprocessing Functions ===
+def smooth_data(data, window_size=5):
+    """
+    Moving average over a Series or all columns of a DataFrame at once.
+    The warm-up samples take the first full-window mean, like rolling().mean().bfill().
+    float32 and int16 data keep their dtype.
+    """
+    smoothed = moving_average(data.to_numpy(), window_size)
+    if len(smoothed) >= window_size:
+        smoothed[:window_size - 1] = smoothed[window_size - 1]
 
-    df = df.reindex(new_time_index)
-    df.index.name = 'time_s'
-    df = df.infer_objects()
-    df.interpolate(method='linear', inplace=True)
-    df.reset_index(inplace=True)
-    return df
+    if isinstance(data, pd.DataFrame):
+        return pd.DataFrame(smoothed, index=data.index, columns=data.columns)
+    return pd.Series(smoothed, index=data.index, name=data.name)
 
 
-def preprocess_and_save():
-    """ Load, preprocess, and save the cleaned CSVs to Cleaned/{gesture}/ folder """
+def interpolate_data(df, interval=0.05):
+    """ Resample a recording onto an `interval`-second grid, keeping the cleaned CSV columns """
+    time_s, values = resample(df['time'].to_numpy(), df[AXES].to_numpy(), interval)
+
+    cleaned = pd.DataFrame(values, columns=AXES)
+    cleaned.insert(0, 'time_s', time_s)
+    cleaned.insert(1, 'id', np.arange(len(cleaned)))
+    cleaned.insert(2, 'wizardName', df['wizardName'].iloc[0] if len(df) else '')
+    cleaned.insert(3, 'spellName', df['spellName'].iloc[0] if len(df) else '')
+    cleaned['time'] = time_s * 1000
+    return cleaned
+
+
+def preprocess_file(file_path, output_path):
+    """ Smooth, interpolate and save one recording; returns (source fingerprint, stage timings) """
+    timer = Instrumentation('preprocess_file', environment=False)
+
+    with timer.stage('read_csv'):
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        df = pd.read_csv(io.BytesIO(content), sep=';', dtype=dict.fromkeys(AXES, working_dtype(SAMPLE_DTYPE)))
+        df = df.assign(**{axis: quantize(df[axis].to_numpy(), SAMPLE_DTYPE) for axis in AXES})
+
+    # Repair
+    if REPAIR:
+        with timer.stage('repair'):
+            keep, values = repair_recording(df['time'].to_numpy(), df[AXES].to_numpy(), MAX_GAP_MS)
+            df = df.iloc[keep].reset_index(drop=True)
+            df = df.assign(**dict(zip(AXES, values.T)))
+
+    # Smoothing
+    with timer.stage('smooth'):
+        df = df.assign(**smooth_data(df[AXES], WINDOW_SIZE))
+
+    # Interpolation
+    with timer.stage('interpolate'):
+        df = interpolate_data(df, INTERVAL)
+
+    with timer.stage('write_csv'):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        df.to_csv(output_path, sep=';', index=False)
+    return file_fingerprint(file_path, content), timer.stages
+
+
+def find_sources():
+    """ Yield (manifest key, person, gesture, source path, cleaned output path) for every raw recording """
+    catalog = load_catalog()
     for person in persons:
-        for gesture in gestures:
-            csv_files = glob.glob(
-                f"C:/Users/Ziad Morsy/PycharmProjects/group-c/project-one/Ziad's Data/{person}/{gesture}/*.csv")
-
-            for file_path in csv_files:
-                print(f"Preprocessing {file_path} for {person}...")
-                df = pd.read_csv(file_path, sep=';')
-
-                # Smoothing
-                for axis in ['accX', 'accY', 'accZ', 'gyroX', 'gyroY', 'gyroZ']:
-                    df[axis] = smooth_data(df[axis])
+        for path, entry in catalog.query('raw', gestures, folders=[f"Ziad's Data/{person}"]):
+            file_path = os.path.join(DATA_ROOT, path)
+            filename = os.path.basename(file_path).replace(".csv", f"_{person}_cleaned.csv")
+            output_path = os.path.join(CLEANED_DIR, entry['gesture'], filename)
+            key = os.path.relpath(file_path, BASE_DIR).replace(os.sep, '/')
+            yield key, person, entry['gesture'], file_path, output_path
+
+
+def validate_sources(found):
+    """
+    Validate every raw recording in one pass and write the report.
+    Returns the manifest keys of the recordings too short to keep.
+    """
+    report = validate_files([file_path for _, _, _, file_path, _ in found], MIN_SAMPLES, MAX_GAP_MS)
+    report['file'] = [key for key, _, _, _, _ in found]
+    report.to_csv(VALIDATION_REPORT, sep=';', index=False)
+
+    flagged = int(report[ISSUES].any(axis=1).sum())
+    print(f"🔎 Validated {len(report)} recordings, {flagged} flagged: {summarize(report)}")
+    print(f"   Report saved as {VALIDATION_REPORT}")
+    return set(report.loc[report['too_short'], 'file'])
+
+
+def preprocess_and_save(workers=None, run=None):
+    """
+    Load, preprocess, and save the cleaned CSVs to Cleaned/{gesture}/ folder.
+    All sources are validated first; recordings too short to keep are skipped.
+    Files run in parallel across processes; sources whose fingerprint matches the
+    manifest of the previous run (and whose output still exists) are skipped.
+    The binary store is rebuilt whenever any cleaned file changed.
+    Stage timings, including those of the worker processes, go to `run`.
+    """
+    run = run or Instrumentation('preprocessor', environment=False)
+    params = {'window_size': WINDOW_SIZE, 'interval': INTERVAL, 'version': PIPELINE_VERSION,
+              'min_samples': MIN_SAMPLES, 'max_gap_ms': MAX_GAP_MS, 'repair': REPAIR, 'dtype': SAMPLE_DTYPE}
+    manifest = load_manifest(MANIFEST_PATH)
+    if manifest.get('params') != params:
+        manifest = {'params': params, 'files': {}}
+    entries = manifest['files']
+
+    with run.stage('find_sources'):
+        found = list(find_sources())
+    with run.stage('validate'):
+        rejected = validate_sources(found) if found else set()
+
+    pending = []
+    skipped = 0
+    sources = {}
+    for key, person, gesture, file_path, output_path in found:
+        if key in rejected:
+            # A stale cleaned copy would still be picked up by the catalog
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            continue
+        sources[key] = (person, gesture, output_path)
+        if os.path.exists(output_path) and is_unchanged(entries.get(key), file_path):
+            skipped += 1
+        else:
+            pending.append((key, person, gesture, file_path, output_path))
+
+    # Forget sources that were deleted or rejected since the last run
+    removed = set(entries) - set(sources)
+    for key in removed:
+        del entries[key]
+
+    print(f"🔄 {len(pending)} files to preprocess, {skipped} unchanged, {len(rejected)} too short.")
+    run.count('files_unchanged', skipped)
+    run.count('files_rejected', len(rejected))
+
+    if pending:
+        with run.stage('preprocess'), ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(preprocess_file, job[3], job[4]): job for job in pending}
+            for future in as_completed(futures):
+                key, person, gesture, file_path, output_path = futures[future]
+                try:
+                    entry, stages = future.result()
+                except Exception as e:
+                    print(f"❌ Failed to preprocess {file_path}: {e}")
+                    entries.pop(key, None)
+                    run.count('files_failed')
+                    continue
+                entry['output'] = os.path.relpath(output_path, BASE_DIR).replace(os.sep, '/')
+                entries[key] = entry
+                # Summed over all workers, so they can add up to more than 'preprocess'
+                run.merge(stages)
+                run.count('files_preprocessed')
+                print(f"✅ Saved cleaned file: {output_path}")
 
-                # Interpolation
-                df = interpolate_data(df)
+    with run.stage('save_manifest'):
+        save_manifest(MANIFEST_PATH, manifest)
 
-                cleaned_folder = f"C:/Users/Ziad Morsy/PycharmProjects/group-c/project-one/Ziad's Data/Cleaned/{gesture}/"
-                os.makedirs(cleaned_folder, exist_ok=True)
+    if pending or removed or not store_exists(STORE_DIR):
+        with run.stage('save_store'):
+            save_store([sources[key] for key in sorted(entries)])
 
-                filename = os.path.basename(file_path).replace(".csv", f"_{person}_cleaned.csv")
-                output_path = os.path.join(cleaned_folder, filename)
 
-                df.to_csv(output_path, sep=';', index=False)
-                print(f"✅ Saved cleaned file: {output_path}")
+def save_store(recordings):
+    """ Rebuild the binary store under Cleaned/store/ from (person, gesture, cleaned path) tuples """
+    write_store(STORE_DIR,
+                [output_path for _, _, output_path in recordings],
+                [gesture for _, gesture, _ in recordings],
+                [person for person, _, _ in recordings],
+                # float32 is precise enough for float64 runs and half the size
+                np.float32 if SAMPLE_DTYPE == 'float64' else SAMPLE_DTYPE)
+    print(f"✅ Saved binary store with {len(recordings)} recordings: {STORE_DIR}")
 
 
-preprocess_and_save()
+if __name__ == '__main__':
+    # Stage timings end up in runs/preprocessor.jsonl, see utils/instrumentation.py
+    run = Instrumentation('preprocessor')
+    preprocess_and_save(run=run)
+    run.finish()
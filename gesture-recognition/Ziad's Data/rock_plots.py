@@ -1,48 +1,32 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import glob
-
-
-def plot_sensor_data(file_path):
-    # Load CSV and use semicolon separator
-    df = pd.read_csv(file_path, sep=';')
-
-    # Convert time from ms to seconds
-    df['time_s'] = df['time'] / 1000
-
-    # Plot
-    plt.figure(figsize=(12, 6))
-
-    # Plot Accelerometer
-    plt.subplot(2, 1, 1)
-    plt.plot(df['time_s'], df['accX'], label='accX')
-    plt.plot(df['time_s'], df['accY'], label='accY')
-    plt.plot(df['time_s'], df['accZ'], label='accZ')
-    plt.title(f'Accelerometer Data - {file_path}')
-    plt.xlabel('Time (s)')
-    plt.ylabel('Acceleration')
-    plt.legend()
-
-    # Plot Gyroscope
-    plt.subplot(2, 1, 2)
-    plt.plot(df['time_s'], df['gyroX'], label='gyroX')
-    plt.plot(df['time_s'], df['gyroY'], label='gyroY')
-    plt.plot(df['time_s'], df['gyroZ'], label='gyroZ')
-    plt.title(f'Gyroscope Data - {file_path}')
-    plt.xlabel('Time (s)')
-    plt.ylabel('Rotation Rate')
-    plt.legend()
-
-    plt.tight_layout()
-    plt.show()
-
-
-# Automatically find all CSV files in the folder
-csv_files = glob.glob("Rock/*.csv")
-
-# Set the maximum number of files to plot
-MAX_PLOTS = 5
-
-# Loop through all CSV files and plot them (limited to MAX_PLOTS)
-for file in csv_files[:MAX_PLOTS]:
-    plot_sensor_data(file)
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.catalog import load_catalog
+from utils.plotting import render_overlay, render_overlay_arrays, render_recordings, render_store_recordings
+from utils.store import RecordingStore, store_exists
+
+GESTURE = 'Rock'
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, 'Cleaned', 'store')
+PLOT_DIR = os.path.join(BASE_DIR, 'plots')
+
+if __name__ == '__main__':
+    # Cleaned recordings from the memory-mapped store once preprocessor.py has run, the raw CSVs otherwise
+    dataset = 'cleaned' if store_exists(STORE_DIR) else 'raw'
+    output_dir = os.path.join(PLOT_DIR, dataset)
+    overlay_path = os.path.join(output_dir, f'{GESTURE}_overlay.png')
+
+    if dataset == 'cleaned':
+        # Every recording as its own image, rendered headlessly in parallel
+        written = render_store_recordings(STORE_DIR, output_dir, [GESTURE])
+        # Mean ± std of all six axes to spot outliers at a glance
+        data, offsets, _ = RecordingStore(STORE_DIR).recordings([GESTURE])
+        overlay = render_overlay_arrays(data, offsets, overlay_path, title=f'{dataset} / {GESTURE}')
+    else:
+        csv_files = load_catalog().paths(dataset, [GESTURE])
+        written = render_recordings(csv_files, output_dir)
+        overlay = render_overlay(csv_files, overlay_path, title=f'{dataset} / {GESTURE}')
+
+    print(f"{len(written)} {GESTURE} recordings plotted to {os.path.join(output_dir, GESTURE)}")
+    print(f"Overlay saved as {overlay}")
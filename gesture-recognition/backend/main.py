@@ -0,0 +1,248 @@
+"""
+Gesture Recognition Backend
+
+FastAPI service around a trained gesture model. The model is loaded once at
+startup; concurrent requests are collected by a micro-batcher and classified
+with one vectorized feature extraction and predict call per batch.
+
+A window is a list of samples, each [accX, accY, accZ, gyroX, gyroY, gyroZ],
+preprocessed the same way as the model's training data.
+
+Run from gesture-recognition/:  python backend/main.py
+Environment:
+    GESTURE_MODEL        model to serve, .pkl (sklearn) or .npz (utils/forest.py export)
+    MAX_BATCH_SIZE       windows per predict call
+    MAX_BATCH_WAIT_MS    how long the first request of a batch waits for company
+"""
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import List
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.catalog import DATA_ROOT
+from utils.features import AXES, extract_features
+from utils.forest import load_model
+
+MODEL_PATH = os.getenv("GESTURE_MODEL", os.path.join(DATA_ROOT, "Ziad's Data", "gesture_model.pkl"))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "64"))
+MAX_BATCH_WAIT_MS = float(os.getenv("MAX_BATCH_WAIT_MS", "5"))
+# Latencies and batch sizes kept for the /metrics percentiles
+METRICS_WINDOW = 1000
+
+
+class Window(BaseModel):
+    samples: List[List[float]]
+
+
+class WindowBatch(BaseModel):
+    windows: List[List[List[float]]]
+
+
+# --- Prediction ---
+def check_window(samples):
+    """ Samples of one window as an array, or a 422 explaining what is wrong with it """
+    if any(len(sample) != len(AXES) for sample in samples):
+        raise HTTPException(status_code=422, detail=f"Every sample needs {len(AXES)} values: {', '.join(AXES)}")
+    window = np.asarray(samples, dtype=np.float64).reshape(-1, len(AXES))
+    if len(window) < 2:
+        raise HTTPException(status_code=422, detail="A window needs at least 2 samples")
+    # The forest predicts in float32, anything beyond its range would fail the whole micro-batch
+    if not np.all(np.isfinite(window) & (np.abs(window) < np.finfo(np.float32).max)):
+        raise HTTPException(status_code=422, detail="Samples must be finite and within float32 range")
+    return window
+
+
+def classify(model, windows):
+    """ [(gesture, confidence)] for many windows with one feature extraction and predict call """
+    offsets = np.zeros(len(windows) + 1, dtype=np.int64)
+    np.cumsum([len(window) for window in windows], out=offsets[1:])
+    X = extract_features(np.concatenate(windows), offsets)
+
+    proba = model.predict_proba(X)
+    # Forests pickled by older scikit-learn versions report leaf counts, not shares
+    proba = proba / proba.sum(axis=1, keepdims=True)
+    best = np.argmax(proba, axis=1)
+    return [(str(model.classes_[i]), float(p[i])) for i, p in zip(best, proba)]
+
+
+class Metrics:
+    """ Request latencies per endpoint and batch sizes, over the last METRICS_WINDOW of each """
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = {}
+        self.latencies = {}
+        self.batches = 0
+        self.batch_sizes = deque(maxlen=METRICS_WINDOW)
+        self.batch_seconds = deque(maxlen=METRICS_WINDOW)
+
+    def record_request(self, endpoint, seconds):
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        self.latencies.setdefault(endpoint, deque(maxlen=METRICS_WINDOW)).append(seconds)
+
+    def record_batch(self, size, seconds):
+        self.batches += 1
+        self.batch_sizes.append(size)
+        self.batch_seconds.append(seconds)
+
+    def summary(self):
+        endpoints = {}
+        for endpoint, latencies in self.latencies.items():
+            ms = np.array(latencies) * 1000
+            endpoints[endpoint] = {
+                'requests': self.requests[endpoint],
+                'latency_ms': {'mean': round(float(ms.mean()), 3),
+                               **{f'p{q}': round(float(np.percentile(ms, q)), 3) for q in (50, 95, 99)}},
+            }
+        sizes = np.array(self.batch_sizes)
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'endpoints': endpoints,
+            'batches': self.batches,
+            'batch_size': {'mean': round(float(sizes.mean()), 2), 'max': int(sizes.max())} if len(sizes) else {},
+            'predict_ms_mean': round(float(np.mean(self.batch_seconds)) * 1000, 3) if self.batch_seconds else None,
+        }
+
+
+class MicroBatcher:
+    """
+    Queue of windows classified in batches: a batch closes when it holds
+    max_batch_size windows or max_wait seconds after its first window arrived.
+    """
+
+    def __init__(self, model, metrics, max_batch_size=MAX_BATCH_SIZE, max_wait=MAX_BATCH_WAIT_MS / 1000):
+        self.model = model
+        self.metrics = metrics
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+    async def submit(self, windows):
+        """ Classify windows, sharing predict calls with concurrent requests """
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in windows]
+        for window, future in zip(windows, futures):
+            self.queue.put_nowait((window, future))
+        return await asyncio.gather(*futures)
+
+    async def next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        while True:
+            batch = await self.next_batch()
+            # Requests that gave up in the meantime are not worth predicting
+            batch = [(window, future) for window, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            try:
+                # In a thread, so requests keep queueing up while the model works
+                results = await asyncio.to_thread(classify, self.model, [window for window, _ in batch])
+            except Exception:
+                # One bad window must not fail its neighbours: classify one by one, only it fails
+                results = await asyncio.to_thread(self.classify_each, [window for window, _ in batch])
+            self.metrics.record_batch(len(batch), time.perf_counter() - start)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def classify_each(self, windows):
+        """ classify per window; the exception in place of the result for windows that fail """
+        results = []
+        for window in windows:
+            try:
+                results.append(classify(self.model, [window])[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.model = load_model(MODEL_PATH)
+    app.state.metrics = Metrics()
+    app.state.batcher = MicroBatcher(app.state.model, app.state.metrics)
+    app.state.batcher.start()
+    yield
+    await app.state.batcher.stop()
+
+
+app = FastAPI(title="Gesture Recognition API", lifespan=lifespan)
+
+
+@app.get("/")
+def root():
+    return {"status": "Backend running.", "model": os.path.basename(MODEL_PATH),
+            "gestures": [str(gesture) for gesture in app.state.model.classes_]}
+
+
+@app.post("/predict")
+async def predict(window: Window):
+    start = time.perf_counter()
+    (gesture, confidence), = await app.state.batcher.submit([check_window(window.samples)])
+    seconds = time.perf_counter() - start
+    app.state.metrics.record_request("/predict", seconds)
+    return {"gesture": gesture, "confidence": confidence, "latency_ms": round(seconds * 1000, 3)}
+
+
+@app.post("/predict/batch")
+async def predict_batch(batch: WindowBatch):
+    start = time.perf_counter()
+    windows = [check_window(samples) for samples in batch.windows]
+    results = await app.state.batcher.submit(windows) if windows else []
+    seconds = time.perf_counter() - start
+    app.state.metrics.record_request("/predict/batch", seconds)
+    return {
+        "predictions": [{"gesture": gesture, "confidence": confidence} for gesture, confidence in results],
+        "latency_ms": round(seconds * 1000, 3),
+    }
+
+
+@app.get("/metrics")
+def metrics():
+    return app.state.metrics.summary()
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=8001)
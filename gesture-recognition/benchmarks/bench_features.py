@@ -0,0 +1,72 @@
+"""
+Extraction cost against held-out accuracy for every extended feature group,
+to pick the cheapest feature set that still meets an accuracy target.
+
+Run from gesture-recognition/:  python benchmarks/bench_features.py --target 0.9
+"""
+import argparse
+import os
+import sys
+import time
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+from utils.catalog import DATASETS, load_catalog
+from utils.features import FEATURE_GROUPS, extract_extended_features, load_recordings
+
+
+def load_dataset(name):
+    catalog = load_catalog()
+    files, labels = [], []
+    for gesture, gesture_files in catalog.files_by_gesture(name, catalog.gestures(name)).items():
+        files += gesture_files
+        labels += [gesture] * len(gesture_files)
+    data, offsets = load_recordings(files)
+    return data, offsets, labels
+
+
+def evaluate(data, offsets, labels, groups, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        X, names = extract_extended_features(data, offsets, groups)
+        best = min(best, time.perf_counter() - start)
+
+    # Same split and model as classifier.py
+    X_train, X_test, y_train, y_test = train_test_split(X, labels, test_size=0.15, stratify=labels, random_state=42)
+    clf = RandomForestClassifier(n_estimators=80, random_state=42, n_jobs=-1)
+    clf.fit(X_train, y_train)
+    return best / len(labels) * 1e6, len(names), clf.score(X_test, y_test)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dataset', choices=DATASETS, default='cleaned')
+    parser.add_argument('--target', type=float, default=0.9, help="held-out accuracy to meet")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    data, offsets, labels = load_dataset(args.dataset)
+    print(f"{args.dataset}: {len(labels)} recordings, {len(data)} samples\n")
+
+    candidates = [[group] for group in FEATURE_GROUPS]
+    candidates += [['basic', group] for group in FEATURE_GROUPS if group != 'basic']
+    candidates.append(FEATURE_GROUPS)
+
+    results = []
+    print(f"{'feature set':<45} {'µs/rec':>8} {'features':>9} {'accuracy':>9}")
+    for groups in candidates:
+        cost, n_features, accuracy = evaluate(data, offsets, labels, groups, args.repeats)
+        results.append((cost, accuracy, groups))
+        print(f"{'+'.join(groups):<45} {cost:>8.2f} {n_features:>9} {accuracy:>9.3f}")
+
+    meeting = [result for result in results if result[1] >= args.target]
+    if meeting:
+        cost, accuracy, groups = min(meeting)
+        print(f"\nCheapest set with accuracy >= {args.target}: {'+'.join(groups)} "
+              f"({cost:.2f} µs/recording, accuracy {accuracy:.3f})")
+    else:
+        print(f"\nNo feature set reaches accuracy {args.target}")
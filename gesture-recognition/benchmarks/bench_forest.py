@@ -0,0 +1,87 @@
+"""
+sklearn RandomForest (joblib pickle) against its flat NumPy export:
+cold import+load time, single-row latency, batch throughput and agreement.
+
+Run from gesture-recognition/:  python benchmarks/bench_forest.py
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+from utils.catalog import load_catalog
+from utils.features import build_dataset
+from utils.forest import FlatForest, export_forest
+
+LOAD_SNIPPETS = {
+    'joblib.load (sklearn)': "import joblib; joblib.load({path!r})",
+    'FlatForest (NumPy)': "import sys; sys.path.append({root!r}); "
+                          "from utils.forest import FlatForest; FlatForest({path!r})",
+}
+
+
+def cold_load_seconds(snippet, repeats):
+    """ Fresh interpreter per run, so module imports are part of the cost """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', snippet], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def per_call_seconds(function, rows, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for row in rows:
+            function(row)
+    return (time.perf_counter() - start) / (repeats * len(rows))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n-estimators', type=int, default=80)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    gestures = ['Rock', 'Paper', 'Scissors']
+    X, y = build_dataset(load_catalog().files_by_gesture('cleaned', gestures))
+    clf = RandomForestClassifier(n_estimators=args.n_estimators, random_state=42).fit(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pkl_path = os.path.join(tmp, 'gesture_model.pkl')
+        npz_path = os.path.join(tmp, 'gesture_model.npz')
+        joblib.dump(clf, pkl_path)
+        export_forest(clf, npz_path)
+        print(f"{args.n_estimators} trees, pickle {os.path.getsize(pkl_path) / 1024:.0f} KiB, "
+              f"export {os.path.getsize(npz_path) / 1024:.0f} KiB\n")
+
+        paths = {'joblib.load (sklearn)': pkl_path, 'FlatForest (NumPy)': npz_path}
+        for name, snippet in LOAD_SNIPPETS.items():
+            seconds = cold_load_seconds(snippet.format(path=paths[name], root=ROOT), args.repeats)
+            print(f"{name:<24} import+load {seconds * 1000:>8.1f} ms")
+
+        flat = FlatForest(npz_path)
+
+    # Random rows spread like the training data exercise many different paths
+    rng = np.random.default_rng(0)
+    batch = rng.normal(X.mean(axis=0), X.std(axis=0), size=(10000, X.shape[1]))
+    rows = [batch[i:i + 1] for i in range(200)]
+
+    agreement = np.mean(clf.predict(batch) == flat.predict(batch))
+    print(f"\nprediction agreement on {len(batch)} rows: {agreement:.4%}\n")
+
+    for name, model in [('sklearn', clf), ('FlatForest', flat)]:
+        single = per_call_seconds(model.predict, rows, args.repeats)
+        start = time.perf_counter()
+        model.predict(batch)
+        batched = (time.perf_counter() - start) / len(batch)
+        print(f"{name:<12} single row {single * 1e6:>9.1f} µs   batch {batched * 1e6:>7.2f} µs/row")
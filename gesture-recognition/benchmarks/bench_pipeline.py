@@ -0,0 +1,129 @@
+"""
+How every stage of the gesture pipeline scales with the dataset size.
+
+For each size a synthetic dataset (benchmarks/synthetic.py) is written to a
+temporary folder and run through CSV loading, smooth_data and interpolate_data
+(the per-file preprocessor path), feature extraction, training and batch and
+single-row prediction. Costs are reported per recording (per row for
+prediction), so a stage that scales linearly keeps a flat line across sizes.
+Each size is also appended to runs/bench_pipeline.jsonl.
+
+Run from gesture-recognition/:  python benchmarks/bench_pipeline.py --sizes 100 1000 10000
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "Ziad's Data"))
+from preprocessor import INTERVAL, WINDOW_SIZE, interpolate_data, smooth_data
+from synthetic import write_dataset
+from utils.features import AXES, extract_features, load_recordings
+from utils.forest import FlatForest, export_forest
+from utils.instrumentation import Instrumentation
+
+# Stage, what its time is divided by
+STAGES = [
+    ('write_csv', 'recording'),
+    ('load_csv', 'recording'),
+    ('read_csv', 'recording'),
+    ('smooth', 'recording'),
+    ('interpolate', 'recording'),
+    ('features', 'recording'),
+    ('fit', 'recording'),
+    ('predict_batch', 'row'),
+    ('predict_single', 'row'),
+    ('predict_single_flat', 'row'),
+]
+
+
+def run_size(size, length, per_file_limit, single_rows, n_estimators, tmp):
+    """ Run every stage on `size` synthetic recordings; returns (summary, {stage: units}) """
+    run = Instrumentation('bench_pipeline', environment=False)
+    units = {}
+    folder = os.path.join(tmp, str(size))
+
+    with run.stage('write_csv'):
+        paths, labels = write_dataset(folder, size, length)
+    labels = np.array(labels)
+    units['write_csv'] = size
+
+    with run.stage('load_csv'):
+        data, offsets = load_recordings(paths)
+    units['load_csv'] = size
+
+    # The preprocessor works file by file in pandas, a sample is enough to see the per-file cost
+    sample = paths[:per_file_limit]
+    for path in sample:
+        with run.stage('read_csv'):
+            with open(path, 'rb') as f:
+                df = pd.read_csv(io.BytesIO(f.read()), sep=';')
+        with run.stage('smooth'):
+            df[AXES] = smooth_data(df[AXES], WINDOW_SIZE)
+        with run.stage('interpolate'):
+            interpolate_data(df, INTERVAL)
+    for stage in ('read_csv', 'smooth', 'interpolate'):
+        units[stage] = len(sample)
+
+    with run.stage('features'):
+        X = extract_features(data, offsets)
+    units['features'] = size
+
+    # Same split and model as classifier.py
+    X_train, X_test, y_train, y_test = train_test_split(X, labels, test_size=0.15, stratify=labels, random_state=42)
+    clf = RandomForestClassifier(n_estimators=n_estimators, random_state=42)
+    with run.stage('fit'):
+        clf.fit(X_train, y_train)
+    units['fit'] = len(y_train)
+
+    with run.stage('predict_batch'):
+        accuracy = np.mean(clf.predict(X_test) == y_test)
+    units['predict_batch'] = len(y_test)
+
+    export_forest(clf, os.path.join(folder, 'gesture_model.npz'))
+    flat = FlatForest(os.path.join(folder, 'gesture_model.npz'))
+    rows = [X_test[i:i + 1] for i in range(min(single_rows, len(X_test)))]
+    for name, model in [('predict_single', clf), ('predict_single_flat', flat)]:
+        with run.stage(name):
+            for row in rows:
+                model.predict(row)
+        units[name] = len(rows)
+
+    run.count('recordings', size)
+    run.count('samples', len(data))
+    summary = run.finish(verbose=False)
+    summary['accuracy'] = float(accuracy)
+    return summary, units
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help="recordings per dataset")
+    parser.add_argument('--length', type=int, default=40, help="mean samples per recording")
+    parser.add_argument('--per-file-limit', type=int, default=2000,
+                        help="recordings timed through the per-file pandas stages")
+    parser.add_argument('--single-rows', type=int, default=200, help="rows timed one at a time")
+    parser.add_argument('--n-estimators', type=int, default=80)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            summary, units = run_size(size, args.length, args.per_file_limit, args.single_rows,
+                                      args.n_estimators, tmp)
+            results.append((summary, units))
+            print(f"{size:>7} recordings, {summary['counters']['samples']:>9} samples: "
+                  f"{summary['total_seconds']:>7.2f} s, held-out accuracy {summary['accuracy']:.3f}")
+
+    print(f"\n{'µs per unit':<22}" + ''.join(f"{size:>12}" for size in args.sizes))
+    for stage, unit in STAGES:
+        costs = [summary['stages'][stage]['seconds'] / max(units[stage], 1) * 1e6 for summary, units in results]
+        print(f"{stage + ' / ' + unit:<22}" + ''.join(f"{cost:>12.1f}" for cost in costs))
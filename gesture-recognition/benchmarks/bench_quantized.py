@@ -0,0 +1,121 @@
+"""
+Memory and throughput of the float64, float32 and int16 sample paths.
+
+Every raw recording in the catalog (raw, spells and last-edition) goes
+through load -> moving average -> 20 Hz resampling -> features with its
+samples held in each dtype. Reported per stage: time, samples/s, the size of
+the stage's output and the peak memory it allocated. The features and the
+held-out accuracy of the classifier show what the smaller types cost.
+
+Run from gesture-recognition/:  python benchmarks/bench_quantized.py --tile 10
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+from utils.catalog import load_catalog
+from utils.features import AXES, SAMPLE_DTYPES, extract_features, load_recordings
+from utils.filters import moving_average
+from utils.resampling import resample
+
+RAW_DATASETS = ['raw', 'spells', 'last-edition']
+
+
+def smooth(data, offsets, window=5):
+    """ moving_average of every recording, stacked like the input """
+    smoothed = np.empty_like(data)
+    for start, stop in zip(offsets[:-1], offsets[1:]):
+        smoothed[start:stop] = moving_average(data[start:stop], window)
+    return smoothed
+
+
+def resample_all(times, data, offsets):
+    """ Every recording resampled to 20 Hz, as stacked (data, offsets) """
+    parts = [resample(times[start:stop], data[start:stop])[1] for start, stop in zip(offsets[:-1], offsets[1:])]
+    new_offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    np.cumsum([len(part) for part in parts], out=new_offsets[1:])
+    return np.concatenate(parts), new_offsets
+
+
+def run_pipeline(paths, times, dtype):
+    """ Stage by stage: [(stage, seconds, samples in, output)] and the features """
+    stages = []
+    start = time.perf_counter()
+    data, offsets = load_recordings(paths, AXES, dtype)
+    stages.append(('load', time.perf_counter() - start, len(data), data))
+
+    start = time.perf_counter()
+    smoothed = smooth(data, offsets)
+    stages.append(('smooth', time.perf_counter() - start, len(data), smoothed))
+
+    start = time.perf_counter()
+    resampled, resampled_offsets = resample_all(times, smoothed, offsets)
+    stages.append(('resample', time.perf_counter() - start, len(smoothed), resampled))
+
+    start = time.perf_counter()
+    X = extract_features(resampled, resampled_offsets)
+    stages.append(('features', time.perf_counter() - start, len(resampled), X))
+    return stages, X
+
+
+def peak_memory(paths, times, dtype):
+    """ Peak traced allocation of every stage, measured in a separate run """
+    peaks = {}
+
+    def traced(name, function, *inputs):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = function(*inputs)
+        peaks[name] = tracemalloc.get_traced_memory()[1] - base
+        return result
+
+    tracemalloc.start()
+    data, offsets = traced('load', load_recordings, paths, AXES, dtype)
+    smoothed = traced('smooth', smooth, data, offsets)
+    resampled, resampled_offsets = traced('resample', resample_all, times, smoothed, offsets)
+    traced('features', extract_features, resampled, resampled_offsets)
+    tracemalloc.stop()
+    return peaks
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tile', type=int, default=1, help="times every recording is repeated, to scale up")
+    args = parser.parse_args()
+
+    catalog = load_catalog()
+    entries = [entry for dataset in RAW_DATASETS for _, entry in catalog.query(dataset)]
+    paths = [path for dataset in RAW_DATASETS for path in catalog.paths(dataset)] * args.tile
+    labels = np.array([f"{entry['dataset']}/{entry['gesture']}" for entry in entries] * args.tile)
+    times, _ = load_recordings(paths, ['time'])
+    times = times[:, 0]
+    print(f"{len(paths)} recordings, {len(times)} samples\n")
+
+    print(f"{'dtype':<9} {'stage':<10} {'seconds':>8} {'samples/s':>12} {'output MiB':>11} {'peak MiB':>9}")
+    features = {}
+    for dtype in SAMPLE_DTYPES:
+        stages, features[dtype] = run_pipeline(paths, times, dtype)
+        peaks = peak_memory(paths, times, dtype)
+        for name, seconds, samples, output in stages:
+            print(f"{dtype:<9} {name:<10} {seconds:>8.3f} {samples / seconds:>12,.0f} "
+                  f"{output.nbytes / 2 ** 20:>11.2f} {peaks[name] / 2 ** 20:>9.2f}")
+        print()
+
+    # Same split and model as classifier.py
+    reference = features['float64']
+    scale = np.nanmax(np.abs(reference), axis=0)
+    for dtype in SAMPLE_DTYPES:
+        X = np.nan_to_num(features[dtype])
+        X_train, X_test, y_train, y_test = train_test_split(X, labels, test_size=0.15, stratify=labels,
+                                                            random_state=42)
+        clf = RandomForestClassifier(n_estimators=80, random_state=42).fit(X_train, y_train)
+        error = np.nanmax(np.abs(features[dtype] - reference) / scale)
+        print(f"{dtype:<9} max feature error {error:.2e} of range, held-out accuracy {clf.score(X_test, y_test):.3f}")
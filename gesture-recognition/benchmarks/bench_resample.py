@@ -0,0 +1,78 @@
+"""
+Per-recording time and allocations of interpolate_data: the old pandas
+reindex/interpolate version against the np.interp-style resampler.
+
+Run from gesture-recognition/:  python benchmarks/bench_resample.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "Ziad's Data"))
+from preprocessor import interpolate_data
+from utils.catalog import load_catalog
+from utils.features import AXES
+from utils.resampling import resample
+
+
+def legacy_interpolate_data(df, interval=0.05):
+    """ interpolate_data as it was before the NumPy resampler """
+    df['time_s'] = df['time'] / 1000
+    df.set_index('time_s', inplace=True)
+    df = df[~df.index.duplicated(keep='first')]
+
+    new_time_index = pd.RangeIndex(start=int(df.index.min() * 1000),
+                                   stop=int(df.index.max() * 1000),
+                                   step=int(interval * 1000)) / 1000
+
+    df = df.reindex(new_time_index)
+    df.index.name = 'time_s'
+    df = df.infer_objects()
+    df.interpolate(method='linear', inplace=True)
+    df.reset_index(inplace=True)
+    return df
+
+
+def measure(name, function, frames, repeats=5):
+    # Timing without tracemalloc, it slows allocations down considerably
+    best = float('inf')
+    for _ in range(repeats):
+        copies = [df.copy() for df in frames]
+        start = time.perf_counter()
+        for df in copies:
+            function(df)
+        best = min(best, time.perf_counter() - start)
+
+    copies = [df.copy() for df in frames]
+    tracemalloc.start()
+    allocated = peak = 0
+    for df in copies:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        function(df)
+        current, call_peak = tracemalloc.get_traced_memory()
+        peak = max(peak, call_peak - before)
+        allocated += max(call_peak - before, 0)
+    tracemalloc.stop()
+
+    n = len(frames)
+    print(f"{name:<28} {best / n * 1e6:>10.1f} µs/recording   "
+          f"{allocated / n / 1024:>8.1f} KiB/recording   peak {peak / 1024:>8.1f} KiB")
+
+
+if __name__ == '__main__':
+    files = load_catalog().paths('raw')
+    frames = [pd.read_csv(file_path, sep=';') for file_path in files]
+    print(f"{len(frames)} raw recordings\n")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        measure('pandas reindex/interpolate', legacy_interpolate_data, frames)
+    measure('interpolate_data (NumPy)', interpolate_data, frames)
+    measure('resample (arrays only)', lambda df: resample(df['time'].to_numpy(), df[AXES].to_numpy()), frames)
@@ -0,0 +1,114 @@
+"""
+Sustained throughput and detection quality of the streaming segmenter.
+
+Held-out raw recordings, resampled to the 20 Hz of the preprocessing
+pipeline, are joined into one continuous stream with noisy rest periods in
+between, then pushed one sample at a time through the segmenter alone and
+through segmenter + classifier.
+
+Run from gesture-recognition/:  python benchmarks/bench_segmentation.py --repeat 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+from utils.catalog import load_catalog
+from utils.features import AXES, extract_features, load_recordings
+from utils.forest import FlatForest, export_forest
+from utils.resampling import resample
+from utils.segmentation import MotionSegmenter, SegmentClassifier
+
+
+def load_resampled(file_paths):
+    """ Raw recordings resampled to 20 Hz, as a list of (n_samples, n_axes) arrays """
+    data, offsets = load_recordings(file_paths, columns=['time'] + AXES)
+    return [resample(data[start:stop, 0], data[start:stop, 1:])[1] for start, stop in zip(offsets[:-1], offsets[1:])]
+
+
+def build_stream(recordings, labels, rest, noise, rng):
+    """ One continuous stream of the recordings with rest periods; returns (stream, [(start, stop, label)]) """
+    parts, truth, position = [], [], 0
+    pose = recordings[0][0]
+    for recording, label in zip(recordings, labels):
+        # The hand rests where the previous gesture ended
+        parts += [pose + rng.normal(0, noise, (rest, len(pose))), recording]
+        pose = recording[-1]
+        truth.append((position + rest, position + rest + len(recording), label))
+        position += rest + len(recording)
+    parts.append(pose + rng.normal(0, noise, (rest, len(pose))))
+    return np.concatenate(parts), truth
+
+
+def match(detected, truth):
+    """ Pair every true gesture with the detected segment overlapping it most (IoU > 0.5) """
+    pairs = []
+    for gesture in truth:
+        start, stop, _ = gesture
+        best, best_iou = None, 0.5
+        for segment in detected:
+            overlap = min(stop, segment[1]) - max(start, segment[0])
+            iou = overlap / (max(stop, segment[1]) - min(start, segment[0]))
+            if iou > best_iou:
+                best, best_iou = segment, iou
+        if best is not None:
+            pairs.append((gesture, best))
+    return pairs
+
+
+def throughput(function, stream):
+    start = time.perf_counter()
+    results = list(function(stream))
+    return len(stream) / (time.perf_counter() - start), results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rest', type=int, default=40, help="rest samples between gestures")
+    parser.add_argument('--noise', type=float, default=60.0, help="sensor noise std during rest")
+    parser.add_argument('--repeat', type=int, default=5, help="times the held-out recordings are streamed")
+    args = parser.parse_args()
+
+    gestures = ['Rock', 'Paper', 'Scissors']
+    files_by_gesture = load_catalog().files_by_gesture('raw', gestures)
+    files = [path for gesture in gestures for path in files_by_gesture[gesture]]
+    labels = np.array([gesture for gesture in gestures for _ in files_by_gesture[gesture]])
+
+    # Train on 85% as classifier.py does, stream only the held-out recordings
+    train_files, test_files, train_labels, test_labels = train_test_split(
+        files, labels, test_size=0.15, stratify=labels, random_state=42)
+    train = load_resampled(train_files)
+    offsets = np.concatenate([[0], np.cumsum([len(recording) for recording in train])])
+    clf = RandomForestClassifier(n_estimators=80, random_state=42)
+    clf.fit(extract_features(np.concatenate(train), offsets), train_labels)
+    with tempfile.TemporaryDirectory() as tmp:
+        export_forest(clf, os.path.join(tmp, 'gesture_model.npz'))
+        model = FlatForest(os.path.join(tmp, 'gesture_model.npz'))
+
+    test = load_resampled(test_files) * args.repeat
+    stream, truth = build_stream(test, list(test_labels) * args.repeat, args.rest, args.noise,
+                                 np.random.default_rng(0))
+    print(f"{len(truth)} gestures, {len(stream)} samples "
+          f"({len(stream) / 20 / 60:.1f} min of stream at 20 Hz)\n")
+
+    rate, segments = throughput(MotionSegmenter().run, stream)
+    print(f"segmenter only          {rate:>12,.0f} samples/s")
+    rate, results = throughput(SegmentClassifier(model).run, stream)
+    print(f"segmenter + classifier  {rate:>12,.0f} samples/s")
+
+    pairs = match(segments, truth)
+    print(f"\n{len(segments)} segments detected, {len(pairs)}/{len(truth)} gestures matched (IoU > 0.5)")
+    if pairs:
+        errors = [abs(segment[0] - start) + abs(segment[1] - stop) for (start, stop, _), segment in pairs]
+        print(f"mean boundary error {np.mean(errors) / 2:.1f} samples")
+
+    labelled = {(start, stop): label for start, stop, label in results}
+    correct = sum(labelled[(segment[0], segment[1])] == gesture[2] for gesture, segment in pairs)
+    print(f"label accuracy on matched gestures {correct / max(len(pairs), 1):.3f}")
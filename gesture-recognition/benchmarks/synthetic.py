@@ -0,0 +1,96 @@
+"""
+Synthetic IMU recordings in the raw CSV schema, for benchmarks at sizes the
+real data does not reach.
+
+Every gesture is a smooth template per axis; recordings vary it in amplitude,
+speed and sensor offset and add noise, so the classifier has real structure to
+learn. Timestamps follow the ~10 Hz of the phone recordings with jitter.
+
+Run from gesture-recognition/:  python benchmarks/synthetic.py /tmp/synthetic --recordings 10000
+"""
+import argparse
+import os
+
+import numpy as np
+
+HEADER = 'id;wizardName;spellName;accX;accY;accZ;gyroX;gyroY;gyroZ;time'
+GESTURES = ['Rock', 'Paper', 'Scissors']
+PERSONS = ['Z', 'K']
+
+INTERVAL_MS = 100        # raw sample interval
+INTERVAL_JITTER_MS = 8   # std of the interval
+ACC_RANGE = 16000        # rough amplitude of the accelerometer axes
+GYRO_RANGE = 4000        # and of the gyroscope axes
+
+
+def gesture_templates(gestures, rng, harmonics=3):
+    """ {gesture: (pose, amplitudes, frequencies, phases)} describing one smooth curve per axis """
+    scale = np.array([ACC_RANGE] * 3 + [GYRO_RANGE] * 3)
+    templates = {}
+    for gesture in gestures:
+        templates[gesture] = (
+            rng.uniform(-0.5, 0.5, 6) * scale,
+            rng.uniform(0.1, 0.5, (harmonics, 6)) * scale,
+            rng.uniform(0.5, 3.0, (harmonics, 6)),
+            rng.uniform(0, 2 * np.pi, (harmonics, 6)),
+        )
+    return templates
+
+
+def generate_recording(template, length, rng, noise=0.1):
+    """ (times in ms, values of shape (length, 6)) of one variation of a template """
+    pose, amplitudes, frequencies, phases = template
+    # Gestures are performed faster or slower and a bit stronger or weaker
+    progress = np.linspace(0, 1, length)[:, None] * rng.uniform(0.8, 1.2)
+    wave = np.sin(2 * np.pi * frequencies[:, None, :] * progress + phases[:, None, :])
+    values = pose * rng.normal(1, 0.05, 6) + (amplitudes[:, None, :] * wave).sum(axis=0) * rng.normal(1, 0.1)
+    values += rng.normal(0, noise, values.shape) * amplitudes.sum(axis=0)
+
+    intervals = np.maximum(rng.normal(INTERVAL_MS, INTERVAL_JITTER_MS, length - 1), 1)
+    times = np.concatenate([[0], np.cumsum(intervals)]).round()
+    return times, np.clip(values.round(), -32768, 32767)
+
+
+def format_recording(times, values, person, gesture):
+    """ CSV text of one recording, the way the recording app writes it """
+    rows = [f"{i};{person};{gesture};" + ';'.join(f"{value:.1f}" for value in row) + f";{time:.0f}"
+            for i, (row, time) in enumerate(zip(values, times))]
+    return HEADER + '\n' + '\n'.join(rows) + '\n'
+
+
+def write_dataset(output_dir, recordings, length=40, gestures=GESTURES, persons=PERSONS, seed=0):
+    """
+    Write `recordings` CSVs as <output_dir>/<person>/<gesture>/recording-<n>.csv,
+    gestures and persons in turn. Lengths vary by ±25% around `length`.
+    Returns ([absolute paths], [gesture of each path]).
+    """
+    rng = np.random.default_rng(seed)
+    templates = gesture_templates(gestures, rng)
+
+    paths, labels = [], []
+    for n in range(recordings):
+        gesture = gestures[n % len(gestures)]
+        person = persons[n // len(gestures) % len(persons)]
+        folder = os.path.join(output_dir, person, gesture)
+        os.makedirs(folder, exist_ok=True)
+
+        size = max(2, int(round(length * rng.uniform(0.75, 1.25))))
+        times, values = generate_recording(templates[gesture], size, rng)
+        path = os.path.join(folder, f"recording-{n:06d}.csv")
+        with open(path, 'w') as f:
+            f.write(format_recording(times, values, person, gesture))
+        paths.append(path)
+        labels.append(gesture)
+    return paths, labels
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output_dir')
+    parser.add_argument('--recordings', type=int, default=1000)
+    parser.add_argument('--length', type=int, default=40, help="mean samples per recording")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths, _ = write_dataset(args.output_dir, args.recordings, args.length, seed=args.seed)
+    print(f"{len(paths)} recordings written to {args.output_dir}")
@@ -0,0 +1,7 @@
+"""
+Shared training pipeline for the gesture classifiers.
+
+Run from gesture-recognition/:
+    python -m training train --dataset cleaned --gestures Rock Paper Scissors --workers 4
+"""
+from training.pipeline import BACKENDS, PRESETS, load_features, train
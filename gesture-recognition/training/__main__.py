@@ -0,0 +1,38 @@
+"""
+Train a gesture classifier on any catalog dataset.
+
+Run from gesture-recognition/:
+    python -m training train --dataset cleaned
+    python -m training train --dataset spells --gestures Tornado Slash --workers 4
+    python -m training train --dataset raw --backend dtw --test-size 0.2
+"""
+import argparse
+
+from training.pipeline import BACKENDS, PRESETS, train
+from utils.catalog import DATASETS
+from utils.instrumentation import Instrumentation
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='python -m training', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('train', help="train, evaluate and save a model")
+    command.add_argument('--dataset', choices=DATASETS, default='cleaned')
+    command.add_argument('--gestures', nargs='+', help=f"default: the preset ({', '.join(PRESETS)}) "
+                                                       "or every gesture of the dataset")
+    command.add_argument('--workers', type=int, help="processes loading recordings, default all cores")
+    command.add_argument('--backend', choices=BACKENDS, default='forest')
+    command.add_argument('--n-estimators', type=int)
+    command.add_argument('--test-size', type=float, help="held-out share, 0 trains on everything")
+    command.add_argument('--augment-copies', type=int, default=0, help="see utils/augmentation.py")
+    command.add_argument('--output-dir', help="where the model goes, default the dataset's folder")
+    command.add_argument('--no-cache', action='store_true', help="recompute every feature")
+    command.add_argument('--plot', action='store_true', help="show the confusion matrix")
+    args = parser.parse_args()
+
+    # Stage timings end up in runs/train-<dataset>.jsonl, see utils/instrumentation.py
+    run = Instrumentation(f'train-{args.dataset}')
+    train(args.dataset, args.gestures, args.workers, args.backend, args.n_estimators, args.test_size,
+          args.augment_copies, args.output_dir, not args.no_cache, args.plot, run)
+    run.finish()
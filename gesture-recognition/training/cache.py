@@ -0,0 +1,59 @@
+"""
+On-disk cache of per-recording features.
+
+Rows are keyed by the SHA-1 of the recording's file, so any change to a file
+(including re-running the preprocessor with other parameters) is a miss,
+while recordings shared between datasets and gesture lists are only
+featurized once. Every feature configuration gets its own cache file.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from utils.catalog import DATA_ROOT
+
+CACHE_DIR = os.path.join(DATA_ROOT, '.cache', 'features')
+# Bump whenever the features change for the same parameters
+CACHE_VERSION = 1
+
+
+class FeatureCache:
+    """ Feature rows of one configuration, looked up by file hash """
+
+    def __init__(self, params, cache_dir=CACHE_DIR):
+        key = json.dumps({'params': params, 'version': CACHE_VERSION}, sort_keys=True)
+        self.path = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest()[:16] + '.npz')
+        self.rows = {}
+        self.changed = False
+        if os.path.exists(self.path):
+            try:
+                with np.load(self.path) as arrays:
+                    self.rows = dict(zip(arrays['keys'], arrays['X']))
+            except (OSError, ValueError, KeyError):
+                # A corrupt cache only costs recomputing the features
+                self.rows = {}
+
+    def lookup(self, keys):
+        """ Boolean mask of the keys with cached rows """
+        return np.array([key in self.rows for key in keys], dtype=bool)
+
+    def get(self, keys):
+        return np.stack([self.rows[key] for key in keys])
+
+    def put(self, keys, X):
+        for key, row in zip(keys, X):
+            self.rows[key] = row
+        self.changed = True
+
+    def save(self):
+        """ Write atomically, and only if rows were added """
+        if not self.changed or not self.rows:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, keys=np.array(list(self.rows)), X=np.stack(list(self.rows.values())))
+        os.replace(tmp_path, self.path)
+        self.changed = False
@@ -0,0 +1,51 @@
+"""
+Parallel loading of catalog recordings, from the binary store when it has them.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.catalog import DATA_ROOT
+from utils.features import load_recordings, select_recordings
+from utils.store import RecordingStore, store_exists
+
+STORE_DIR = os.path.join(DATA_ROOT, "Ziad's Data", 'Cleaned', 'store')
+# Below this many files per worker, starting processes costs more than it saves
+MIN_FILES_PER_WORKER = 64
+
+
+def stack_recordings(parts):
+    """ Join [(data, offsets)] into one stacked (data, offsets), in order """
+    lengths = np.concatenate([np.diff(offsets) for _, offsets in parts])
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return np.concatenate([data for data, _ in parts]), offsets
+
+
+def load_parallel(file_paths, workers=None):
+    """ load_recordings split across processes, same (data, offsets) as one call """
+    workers = min(workers or os.cpu_count() or 1, len(file_paths) // MIN_FILES_PER_WORKER)
+    if workers <= 1:
+        return load_recordings(file_paths)
+
+    # A few chunks per worker evens out files of different sizes
+    chunks = np.array_split(np.arange(len(file_paths)), workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(load_recordings, [[file_paths[i] for i in chunk] for chunk in chunks]))
+    return stack_recordings(parts)
+
+
+def load_entries(entries, workers=None, store_dir=STORE_DIR):
+    """
+    (data, offsets) of catalog (relative path, entry) pairs, in order. Cleaned
+    recordings come out of the memory-mapped store when it holds all of them.
+    """
+    if entries and store_exists(store_dir) and all(entry['dataset'] == 'cleaned' for _, entry in entries):
+        store = RecordingStore(store_dir)
+        index = {name: i for i, name in enumerate(store.files)}
+        names = [os.path.basename(path) for path, _ in entries]
+        if all(name in index for name in names):
+            return select_recordings(store.data, store.offsets, [index[name] for name in names])
+
+    return load_parallel([os.path.join(DATA_ROOT, path) for path, _ in entries], workers)
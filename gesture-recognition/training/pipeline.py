@@ -0,0 +1,212 @@
+"""
+One training pipeline for every gesture dataset in the catalog.
+"""
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import train_test_split
+
+from training.cache import FeatureCache
+from training.loading import load_entries
+from utils.augmentation import augment_dataset
+from utils.catalog import DATA_ROOT, load_catalog
+from utils.dtw import DtwClassifier
+from utils.features import extract_features, resample_segments, select_recordings
+from utils.forest import export_forest
+from utils.instrumentation import Instrumentation
+
+# === Dataset Presets ===
+# What the two original scripts trained; other datasets use DEFAULTS and all their gestures
+PRESETS = {
+    'cleaned': {'gestures': ['Rock', 'Paper', 'Scissors'], 'n_estimators': 80, 'test_size': 0.15,
+                'output_dir': "Ziad's Data"},
+    'spells': {'gestures': ['Tornado', 'Slash', 'Avada Kedavra'], 'n_estimators': 100, 'test_size': 0,
+               'output_dir': 'Khaloud Data'},
+}
+DEFAULTS = {'n_estimators': 80, 'test_size': 0.15}
+
+# === Backends ===
+# 'forest': RandomForest on mean/std features
+# 'dtw':    1-NN dynamic time warping on resampled recordings, see utils/dtw.py
+BACKENDS = ['forest', 'dtw']
+DTW_LENGTH = 32
+DTW_BAND = 0.1
+
+
+def feature_params(backend):
+    """ Everything the cached feature rows depend on besides the recordings themselves """
+    if backend == 'dtw':
+        return {'backend': 'dtw', 'length': DTW_LENGTH}
+    return {'backend': 'forest', 'features': 'mean_std'}
+
+
+def featurize(data, offsets, backend='forest'):
+    """ Model input of stacked recordings for a backend """
+    if backend == 'dtw':
+        return resample_segments(data, offsets, DTW_LENGTH)
+    return extract_features(data, offsets)
+
+
+def load_features(entries, backend='forest', workers=None, cache=True, keep_recordings=False, run=None):
+    """
+    Features of catalog (relative path, entry) pairs, taking what it can from the
+    feature cache. Returns (X, data, offsets); data and offsets are only loaded
+    (and otherwise None) when something is missing or keep_recordings is set.
+    """
+    run = run or Instrumentation('load_features', environment=False)
+    keys = [entry['sha1'] for _, entry in entries]
+    feature_cache = FeatureCache(feature_params(backend)) if cache else None
+    cached = feature_cache.lookup(keys) if cache else np.zeros(len(entries), dtype=bool)
+    run.count('cached_recordings', int(cached.sum()))
+
+    data = offsets = None
+    if keep_recordings or not cached.all():
+        with run.stage('load'):
+            # Everything when the recordings themselves are needed, otherwise only the misses
+            wanted = np.arange(len(entries)) if keep_recordings else np.flatnonzero(~cached)
+            data, offsets = load_entries([entries[i] for i in wanted], workers)
+        run.count('samples', len(data))
+
+    with run.stage('features'):
+        if cached.all():
+            X = feature_cache.get(keys)
+        else:
+            missing = np.flatnonzero(~cached)
+            if keep_recordings:
+                X_missing = featurize(*select_recordings(data, offsets, missing), backend)
+            else:
+                X_missing = featurize(data, offsets, backend)
+            X = np.empty((len(entries),) + X_missing.shape[1:])
+            X[missing] = X_missing
+            if cached.any():
+                X[cached] = feature_cache.get([key for key, hit in zip(keys, cached) if hit])
+            if cache:
+                feature_cache.put([keys[i] for i in missing], X_missing)
+                feature_cache.save()
+    return X, data, offsets
+
+
+def print_evaluation(clf, X_test, y_test, gestures, run, plot=False):
+    """ Confusion matrix, classification report and single-recording latency on the test split """
+    with run.stage('predict'):
+        y_pred = clf.predict(X_test)
+
+    # One recording at a time, the way a live gesture is classified
+    with run.stage('query_latency'):
+        start = time.perf_counter()
+        for i in range(len(X_test)):
+            clf.predict(X_test[i:i + 1])
+    print(f"\n⏱ Query latency: {(time.perf_counter() - start) / len(X_test) * 1000:.2f} ms per recording")
+    if isinstance(clf, DtwClassifier):
+        clf.predict(X_test)
+        print(f"⏱ Templates pruned by LB_Keogh: {clf.pruned_:.0%}")
+
+    cm = confusion_matrix(y_test, y_pred, labels=gestures)
+    print("\n🔍 Confusion Matrix:")
+    print(cm)
+
+    print("\n📊 Classification Report:")
+    print(classification_report(y_test, y_pred, labels=gestures, target_names=gestures))
+
+    if plot:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        with run.stage('plot'):
+            plt.figure(figsize=(6, 4))
+            sns.heatmap(cm, annot=True, fmt='d', xticklabels=gestures, yticklabels=gestures, cmap="Blues")
+            plt.xlabel('Predicted')
+            plt.ylabel('Actual')
+            plt.title('Confusion Matrix')
+            plt.tight_layout()
+        plt.show()
+
+
+def train(dataset, gestures=None, workers=None, backend='forest', n_estimators=None, test_size=None,
+          augment_copies=0, output_dir=None, cache=True, plot=False, run=None):
+    """
+    Train, evaluate and save a classifier for catalog dataset `dataset`.
+
+    Presets fill in whatever is left as None. test_size=0 trains on every
+    recording without evaluating. The model is saved to output_dir as
+    gesture_model.pkl plus the gesture_model.npz export (forest), or as
+    gesture_model_dtw.pkl (dtw). Returns the fitted classifier.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    preset = {**DEFAULTS, **PRESETS.get(dataset, {})}
+    catalog = load_catalog()
+    gestures = list(gestures or preset.get('gestures') or catalog.gestures(dataset))
+    n_estimators = n_estimators or preset['n_estimators']
+    test_size = preset['test_size'] if test_size is None else test_size
+    output_dir = output_dir or os.path.join(DATA_ROOT, preset.get('output_dir', os.path.join('models', dataset)))
+    run = run or Instrumentation(f'train-{dataset}')
+
+    # === Load Data ===
+    print(f"🔄 Loading {dataset}: {', '.join(gestures)}...")
+    entries = catalog.query(dataset, gestures)
+    if not entries:
+        raise ValueError(f"No recordings of {gestures} in dataset {dataset!r}")
+    # Same order as the original scripts: gesture by gesture
+    entries.sort(key=lambda item: gestures.index(item[1]['gesture']))
+    y = np.array([entry['gesture'] for _, entry in entries])
+
+    X, data, offsets = load_features(entries, backend, workers, cache, keep_recordings=augment_copies > 0, run=run)
+    run.count('recordings', len(y))
+    print(f"✅ Data loaded and processed ({len(y)} recordings, {run.counters['cached_recordings']} from cache).")
+
+    # === Split Data ===
+    if test_size:
+        train_index, test_index = train_test_split(np.arange(len(y)), test_size=test_size, stratify=y,
+                                                   random_state=42)
+    else:
+        train_index, test_index = np.arange(len(y)), np.arange(0)
+    X_train, y_train = X[train_index], y[train_index]
+
+    # === Augment the Training Split ===
+    if augment_copies:
+        # Generated batch by batch, only the features of the variants are kept
+        with run.stage('augment'):
+            train_data, train_offsets = select_recordings(data, offsets, train_index)
+            X_extra, y_extra = augment_dataset(train_data, train_offsets, y_train, augment_copies,
+                                               lambda batch, batch_offsets: featurize(batch, batch_offsets, backend))
+            X_train = np.concatenate([X_train, X_extra])
+            y_train = np.concatenate([y_train, y_extra])
+        print(f"✅ Training set augmented to {len(y_train)} recordings ({augment_copies} variants each).")
+
+    # === Train the Model ===
+    if backend == 'dtw':
+        print("🔄 Training the DTW nearest-neighbour model...")
+        clf = DtwClassifier(band=DTW_BAND)
+    else:
+        print("🔄 Training the RandomForest model...")
+        clf = RandomForestClassifier(n_estimators=n_estimators, random_state=42)
+    with run.stage('fit'):
+        clf.fit(X_train, y_train)
+    run.count('training_rows', len(y_train))
+
+    # === Evaluation ===
+    if len(test_index):
+        X_test, y_test = X[test_index], y[test_index]
+        print_evaluation(clf, X_test, y_test, gestures, run, plot)
+        print("\n✅ Train Accuracy:", clf.score(X_train, y_train))
+        print("✅ Test Accuracy:", clf.score(X_test, y_test))
+
+    # === Save the Model ===
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(output_dir, 'gesture_model_dtw.pkl' if backend == 'dtw' else 'gesture_model.pkl')
+    with run.stage('save'):
+        joblib.dump(clf, model_path)
+    print(f"✅ Model trained and saved as {model_path}")
+
+    if backend == 'forest':
+        # Flat node arrays for fast loading/prediction, see utils/forest.py
+        export_path = os.path.join(output_dir, 'gesture_model.npz')
+        with run.stage('export'):
+            export_forest(clf, export_path)
+        print(f"✅ Inference export saved as {export_path}")
+    return clf
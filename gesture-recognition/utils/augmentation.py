@@ -0,0 +1,130 @@
+"""
+Lazy augmentation of stacked recordings for training.
+
+Every transform works on a whole batch of recordings at once in the
+(data, offsets) layout of utils.features.load_recordings. The generators
+produce one batch at a time and turn it into features right away, so an
+N-times augmented training set only ever holds its feature rows, never the
+augmented samples.
+"""
+import numpy as np
+
+from utils.features import extract_features, select_recordings
+
+# Augmentation strength, relative to the data
+JITTER_SIGMA = 0.03       # noise std as a share of each axis' std
+SCALE_SIGMA = 0.1         # per-axis gain, drawn around 1
+WARP_SIGMA = 0.2          # playback speed variation along the recording
+WARP_KNOTS = 4            # speed control points per recording, at least 2
+MAX_ROTATION_DEG = 15     # sensor mount tilt, applied to acc and gyro alike
+
+
+def _sample_ids(offsets):
+    """ Recording index and position inside its recording for every stacked sample """
+    lengths = np.diff(offsets)
+    ids = np.repeat(np.arange(len(lengths)), lengths)
+    return ids, np.arange(offsets[-1]) - offsets[:-1][ids], lengths
+
+
+def time_warp(data, offsets, rng, sigma=WARP_SIGMA, knots=WARP_KNOTS):
+    """ Replay every recording at a smoothly varying speed, keeping its length """
+    ids, position, lengths = _sample_ids(offsets)
+    if not len(ids):
+        return data.copy()
+
+    # Speed at each sample, interpolated between random control points
+    speeds = np.clip(rng.normal(1, sigma, (len(lengths), knots)), 0.2, None)
+    knot = position / np.maximum(lengths[ids] - 1, 1) * (knots - 1)
+    left = np.minimum(np.floor(knot).astype(np.int64), knots - 2)
+    weight = knot - left
+    speed = speeds[ids, left] * (1 - weight) + speeds[ids, left + 1] * weight
+
+    # Cumulative time inside every recording, rescaled to [0, length - 1]
+    elapsed = np.cumsum(speed)
+    start = offsets[:-1][ids]
+    first = elapsed[start]
+    last = elapsed[offsets[1:][ids] - 1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        warped = np.where(last > first, (elapsed - first) / (last - first), 0) * (lengths[ids] - 1)
+
+    below = np.minimum(np.floor(warped).astype(np.int64), lengths[ids] - 1)
+    above = np.minimum(below + 1, lengths[ids] - 1)
+    fraction = (warped - below)[:, None]
+    return data[start + below] * (1 - fraction) + data[start + above] * fraction
+
+
+def rotate(data, offsets, rng, max_degrees=MAX_ROTATION_DEG):
+    """ Rotate the acc and gyro triplets of every recording by one small random rotation """
+    ids, _, lengths = _sample_ids(offsets)
+    n = len(lengths)
+
+    # Rodrigues' formula for a random axis and angle per recording
+    axis = rng.normal(size=(n, 3))
+    axis /= np.linalg.norm(axis, axis=1, keepdims=True)
+    angle = np.radians(rng.uniform(-max_degrees, max_degrees, n))
+    cross = np.zeros((n, 3, 3))
+    cross[:, 0, 1], cross[:, 0, 2], cross[:, 1, 2] = -axis[:, 2], axis[:, 1], -axis[:, 0]
+    cross -= cross.transpose(0, 2, 1)
+    rotation = (np.eye(3) + np.sin(angle)[:, None, None] * cross
+                + (1 - np.cos(angle))[:, None, None] * cross @ cross)
+
+    rotated = np.empty_like(data)
+    for triplet in (slice(0, 3), slice(3, 6)):
+        rotated[:, triplet] = np.einsum('sij,sj->si', rotation[ids], data[:, triplet])
+    return rotated
+
+
+def scale(data, offsets, rng, sigma=SCALE_SIGMA):
+    """ Multiply every axis of every recording by its own random gain """
+    ids, _, lengths = _sample_ids(offsets)
+    gains = rng.normal(1, sigma, (len(lengths), data.shape[1]))
+    return data * gains[ids]
+
+
+def jitter(data, offsets, rng, sigma=JITTER_SIGMA):
+    """ Add Gaussian noise proportional to each axis' spread """
+    return data + rng.normal(size=data.shape) * (sigma * data.std(axis=0))
+
+
+TRANSFORMS = [time_warp, rotate, scale, jitter]
+
+
+def augment(data, offsets, rng, transforms=TRANSFORMS):
+    """ One augmented copy of every recording, same offsets """
+    data = np.asarray(data, dtype=np.float64)
+    for transform in transforms:
+        data = transform(data, offsets, rng)
+    return data
+
+
+def augmented_batches(data, offsets, labels, copies, batch_size=256, seed=42, transforms=TRANSFORMS):
+    """
+    Yield (data, offsets, labels) batches of `copies` augmented variants of every
+    recording. Only one batch of augmented samples exists at any time.
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels)
+    for _ in range(copies):
+        for start in range(0, len(labels), batch_size):
+            indices = np.arange(start, min(start + batch_size, len(labels)))
+            batch, batch_offsets = select_recordings(data, offsets, indices)
+            yield augment(batch, batch_offsets, rng, transforms), batch_offsets, labels[indices]
+
+
+def augmented_recordings(data, offsets, labels, copies, seed=42, transforms=TRANSFORMS):
+    """ Yield (recording, label) one augmented recording at a time """
+    for batch, batch_offsets, batch_labels in augmented_batches(data, offsets, labels, copies,
+                                                               seed=seed, transforms=transforms):
+        for i, label in enumerate(batch_labels):
+            yield batch[batch_offsets[i]:batch_offsets[i + 1]], label
+
+
+def augment_dataset(data, offsets, labels, copies, featurize=extract_features, batch_size=256, seed=42):
+    """ (X, y) of `copies` augmented variants of every recording, featurized batch by batch """
+    X, y = [], []
+    for batch, batch_offsets, batch_labels in augmented_batches(data, offsets, labels, copies, batch_size, seed):
+        X.append(featurize(batch, batch_offsets))
+        y.append(batch_labels)
+    if not X:
+        return featurize(np.empty((0, data.shape[1])), np.zeros(1, dtype=np.int64)), np.asarray(labels)[:0]
+    return np.concatenate(X), np.concatenate(y)
@@ -0,0 +1,150 @@
+"""
+Persistent index of every recording in the gesture-recognition folder.
+
+The first scan reads each CSV once; later scans only stat the files and re-read
+the ones that are new or changed, so scripts can query recordings by dataset,
+gesture and person instead of globbing hard-coded paths.
+"""
+import io
+import os
+
+import numpy as np
+
+from utils.manifest import file_fingerprint, is_unchanged, load_manifest, save_manifest
+
+DATA_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+CATALOG_PATH = os.path.join(DATA_ROOT, 'catalog.json')
+CATALOG_VERSION = 1
+
+# dataset name -> folders laid out as <folder>/<gesture>/*.csv
+DATASETS = {
+    'spells': ['Khaloud Data'],
+    'raw': ["Ziad's Data/K", "Ziad's Data/Z"],
+    'cleaned': ["Ziad's Data/Cleaned"],
+    'last-edition': ['Last edition'],
+}
+
+
+def describe_recording(content):
+    """ Person, sample count and timing statistics of one CSV recording """
+    text = content.decode('utf-8', errors='replace')
+    header, _, body = text.partition('\n')
+    names = header.strip().split(';')
+    lines = body.strip().splitlines()
+
+    person = ''
+    if lines and 'wizardName' in names:
+        person = lines[0].split(';')[names.index('wizardName')]
+
+    times = np.empty(0)
+    if lines and 'time' in names:
+        times = np.loadtxt(io.StringIO(body), delimiter=';', usecols=[names.index('time')], ndmin=1)
+
+    intervals = np.diff(times)
+    return {
+        'person': person,
+        'samples': len(lines),
+        'duration_ms': float(times[-1] - times[0]) if len(times) else 0.0,
+        'interval_mean_ms': float(intervals.mean()) if len(intervals) else None,
+        'interval_std_ms': float(intervals.std()) if len(intervals) else None,
+        'interval_min_ms': float(intervals.min()) if len(intervals) else None,
+        'interval_max_ms': float(intervals.max()) if len(intervals) else None,
+    }
+
+
+def scan_files():
+    """ Yield (relative path, dataset, gesture, source folder) for every recording on disk """
+    for dataset, folders in DATASETS.items():
+        for folder in folders:
+            base = os.path.join(DATA_ROOT, folder)
+            if not os.path.isdir(base):
+                continue
+            for gesture_dir in sorted(os.scandir(base), key=lambda e: e.name):
+                if not gesture_dir.is_dir():
+                    continue
+                for entry in sorted(os.scandir(gesture_dir.path), key=lambda e: e.name):
+                    if entry.is_file() and entry.name.endswith('.csv'):
+                        yield f"{folder}/{gesture_dir.name}/{entry.name}", dataset, gesture_dir.name, folder
+
+
+def update_catalog(catalog_path=CATALOG_PATH):
+    """ Bring the index on disk up to date; returns (entries, number of files (re)read) """
+    catalog = load_manifest(catalog_path)
+    if catalog.get('version') != CATALOG_VERSION:
+        catalog = {'version': CATALOG_VERSION, 'entries': {}}
+    old_entries = catalog['entries']
+
+    entries = {}
+    read = touched = 0
+    for path, dataset, gesture, folder in scan_files():
+        file_path = os.path.join(DATA_ROOT, path)
+        entry = old_entries.get(path)
+        mtime_ns = entry and entry.get('mtime_ns')
+        if not is_unchanged(entry, file_path):
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            entry = file_fingerprint(file_path, content)
+            entry.update(describe_recording(content))
+            read += 1
+        elif entry['mtime_ns'] != mtime_ns:
+            # Touched but identical content, only the fingerprint moved
+            touched += 1
+        entry.update(dataset=dataset, gesture=gesture, folder=folder)
+        entries[path] = entry
+
+    if read or touched or entries.keys() != old_entries.keys():
+        catalog['entries'] = entries
+        save_manifest(catalog_path, catalog)
+    return entries, read
+
+
+class Catalog:
+    """ Queryable view of the index, see load_catalog """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def query(self, dataset=None, gestures=None, persons=None, folders=None):
+        """ [(relative path, entry)] matching every given filter, in path order """
+        return [
+            (path, entry) for path, entry in sorted(self.entries.items())
+            if (dataset is None or entry['dataset'] == dataset)
+            and (gestures is None or entry['gesture'] in gestures)
+            and (persons is None or entry['person'] in persons)
+            and (folders is None or entry['folder'] in folders)
+        ]
+
+    def paths(self, dataset=None, gestures=None, persons=None, folders=None):
+        """ Absolute paths of the matching recordings """
+        return [os.path.join(DATA_ROOT, path) for path, _ in self.query(dataset, gestures, persons, folders)]
+
+    def files_by_gesture(self, dataset, gestures):
+        """ {gesture: [absolute paths]}, the input of utils.features.build_dataset """
+        return {gesture: self.paths(dataset, [gesture]) for gesture in gestures}
+
+    def gestures(self, dataset):
+        return sorted({entry['gesture'] for entry in self.entries.values() if entry['dataset'] == dataset})
+
+
+def load_catalog(catalog_path=CATALOG_PATH):
+    """ Load the index, picking up recordings added or changed since the last run """
+    entries, _ = update_catalog(catalog_path)
+    return Catalog(entries)
+
+
+# === Dataset Summary ===
+if __name__ == '__main__':
+    entries, read = update_catalog()
+    print(f"{len(entries)} recordings indexed, {read} (re)read\n")
+
+    catalog = Catalog(entries)
+    print(f"{'dataset':<14} {'gesture':<15} {'person':<10} {'files':>6} {'samples':>8} {'rate Hz':>8}")
+    for dataset in DATASETS:
+        for gesture in catalog.gestures(dataset):
+            matches = [entry for _, entry in catalog.query(dataset, [gesture])]
+            for person in sorted({entry['person'] for entry in matches}):
+                rows = [entry for entry in matches if entry['person'] == person]
+                intervals = [entry['interval_mean_ms'] for entry in rows if entry['interval_mean_ms']]
+                rate = 1000 / np.mean(intervals) if intervals else float('nan')
+                print(f"{dataset:<14} {gesture:<15} {person:<10} {len(rows):>6} "
+                      f"{sum(entry['samples'] for entry in rows):>8} {rate:>8.1f}")
@@ -0,0 +1,139 @@
+"""
+1-nearest-neighbour classification of six-axis recordings with dynamic time
+warping, for gestures that mean/std features cannot tell apart because they
+differ in temporal order rather than energy.
+
+Recordings are resampled to a fixed length and standardized per axis with the
+training statistics. A query is first compared to every template with the
+LB_Keogh lower bound; only templates whose bound beats the best distance so far
+get a full DTW, computed in small batches inside a Sakoe-Chiba band and
+abandoned as soon as they can no longer win.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@lru_cache(maxsize=None)
+def band_diagonals(length, radius):
+    """ (i, j) cells of every anti-diagonal i + j = k that lie inside the band |i - j| <= radius """
+    diagonals = []
+    for k in range(2 * length - 1):
+        i = np.arange(max(0, k - length + 1), min(k, length - 1) + 1)
+        j = k - i
+        keep = np.abs(i - j) <= radius
+        diagonals.append((i[keep], j[keep]))
+    return tuple(diagonals)
+
+
+def envelopes(series, radius):
+    """ Upper and lower LB_Keogh envelopes of (n, length, n_axes) series """
+    padded = np.pad(series, ((0, 0), (radius, radius), (0, 0)), mode='edge')
+    windows = sliding_window_view(padded, 2 * radius + 1, axis=1)
+    return windows.max(axis=-1), windows.min(axis=-1)
+
+
+def lb_keogh(query, upper, lower):
+    """ Squared LB_Keogh bound of one (length, n_axes) query against every candidate envelope """
+    above = np.maximum(query - upper, 0)
+    below = np.maximum(lower - query, 0)
+    return (above * above + below * below).sum(axis=(1, 2))
+
+
+def dtw_distances(query, candidates, radius, threshold=np.inf):
+    """
+    Squared-Euclidean DTW of one query against a batch of candidates.
+
+    The cost matrix is filled one anti-diagonal at a time, every cell of a
+    diagonal (and every candidate) in one vectorized step. A warping path
+    visits at least one of any two consecutive anti-diagonals, so once both
+    minima reach `threshold` the candidate is abandoned and reported as inf.
+    """
+    length = len(query)
+    diff = query[None, :, None, :] - candidates[:, None, :, :]
+    cost = np.einsum('nijk,nijk->nij', diff, diff)
+
+    distances = np.full(len(candidates), np.inf)
+    active = np.arange(len(candidates))
+
+    # Slot i + 1 holds cell i of a diagonal, slot 0 is padding for i - 1 = -1
+    before = np.full((len(candidates), length + 1), np.inf)
+    previous = np.full((len(candidates), length + 1), np.inf)
+    previous[:, 1] = cost[:, 0, 0]
+
+    for i, j in band_diagonals(length, radius)[1:]:
+        current = np.full_like(previous, np.inf)
+        best_step = np.minimum(np.minimum(before[:, i], previous[:, i]), previous[:, i + 1])
+        current[:, i + 1] = cost[:, i, j] + best_step
+
+        alive = np.minimum(current.min(axis=1), previous.min(axis=1)) < threshold
+        if not alive.all():
+            if not alive.any():
+                return distances
+            active, cost, previous, current = active[alive], cost[alive], previous[alive], current[alive]
+        before, previous = previous, current
+
+    distances[active] = previous[:, length]
+    return distances
+
+
+class DtwClassifier:
+    """ 1-NN DTW classifier on (n, length, n_axes) series, e.g. from utils.features.resample_segments """
+
+    def __init__(self, band=0.1, batch_size=16):
+        self.band = band
+        self.batch_size = batch_size
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        n_axes = X.shape[2]
+        self.mean_ = X.reshape(-1, n_axes).mean(axis=0)
+        self.std_ = X.reshape(-1, n_axes).std(axis=0)
+        self.std_[self.std_ == 0] = 1
+
+        self.radius_ = math.ceil(self.band * X.shape[1])
+        self.templates_ = self._standardize(X)
+        self.upper_, self.lower_ = envelopes(self.templates_, self.radius_)
+        self.labels_ = np.asarray(y)
+        self.classes_ = np.unique(self.labels_)
+        return self
+
+    def _standardize(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.std_
+
+    def nearest(self, query):
+        """ (template index, squared DTW distance, number of full DTWs) of one standardized query """
+        bounds = lb_keogh(query, self.upper_, self.lower_)
+        order = np.argsort(bounds)
+
+        best, best_index, computed = np.inf, -1, 0
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            # Sorted bounds: once the first of a batch cannot win, nothing after it can
+            batch = batch[bounds[batch] < best]
+            if not len(batch):
+                break
+            distances = dtw_distances(query, self.templates_[batch], self.radius_, best)
+            computed += len(batch)
+            if distances.min() < best:
+                best = distances.min()
+                best_index = batch[np.argmin(distances)]
+        return best_index, best, computed
+
+    def predict(self, X):
+        queries = self._standardize(X)
+        computed = 0
+        predictions = []
+        for query in queries:
+            index, _, n = self.nearest(query)
+            computed += n
+            predictions.append(self.labels_[index])
+        # Share of templates LB_Keogh ruled out without running a full DTW
+        self.pruned_ = 1 - computed / max(len(queries) * len(self.templates_), 1)
+        return np.array(predictions)
+
+    def score(self, X, y):
+        return np.mean(self.predict(X) == np.asarray(y))
+
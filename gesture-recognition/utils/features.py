@@ -0,0 +1,252 @@
+import io
+
+import numpy as np
+
+# === Sensor Layout ===
+AXES = ['accX', 'accY', 'accZ', 'gyroX', 'gyroY', 'gyroZ']
+
+# Same order the classifiers have always used: mean and std for each axis
+FEATURE_NAMES = [f"{axis}_{stat}" for axis in AXES for stat in ('mean', 'std')]
+
+# === Sample Types ===
+# The sensors produce int16 counts; float32 halves and int16 quarters the memory of float64
+SAMPLE_DTYPES = ['float64', 'float32', 'int16']
+
+
+def quantize(values, dtype=np.int16):
+    """ Round and clip to an integer dtype; a plain cast for float dtypes """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in 'iu':
+        return np.asarray(values).astype(dtype, copy=False)
+    info = np.iinfo(dtype)
+    return np.clip(np.rint(values), info.min, info.max).astype(dtype)
+
+
+def working_dtype(dtype):
+    """ Float type for arithmetic on samples of `dtype`: float32 for int16/float32 data, float64 otherwise """
+    return np.result_type(dtype, np.float32)
+
+
+def load_recordings(file_paths, columns=AXES, dtype=np.float64):
+    """
+    Load many semicolon CSV recordings into one stacked array.
+
+    Returns (data, offsets): data has one row per sample of every recording,
+    recording i is data[offsets[i]:offsets[i + 1]].
+    Raw and cleaned recordings may be mixed, columns are looked up by name.
+    Integer dtypes are rounded from the CSV values, use them for sensor axes only.
+    """
+    parse_dtype = working_dtype(dtype) if np.dtype(dtype).kind in 'iu' else dtype
+    lengths = np.zeros(len(file_paths), dtype=np.int64)
+    groups = {}
+
+    for i, file_path in enumerate(file_paths):
+        with open(file_path) as f:
+            header = f.readline().strip()
+            body = f.read().strip()
+        lengths[i] = body.count('\n') + 1 if body else 0
+        groups.setdefault(header, []).append((i, body))
+
+    offsets = np.zeros(len(file_paths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    # One parser call per header layout instead of one per file
+    parsed = {}
+    for header, items in groups.items():
+        names = header.split(';')
+        usecols = [names.index(column) for column in columns]
+        text = '\n'.join(body for _, body in items if body)
+        if text:
+            parsed[header] = quantize(np.loadtxt(io.StringIO(text), delimiter=';', usecols=usecols,
+                                                 dtype=parse_dtype, ndmin=2), dtype)
+        else:
+            parsed[header] = np.empty((0, len(columns)), dtype=dtype)
+
+    if len(parsed) == 1:
+        return next(iter(parsed.values())), offsets
+
+    data = np.empty((offsets[-1], len(columns)), dtype=dtype)
+    for header, items in groups.items():
+        position = 0
+        for i, _ in items:
+            data[offsets[i]:offsets[i + 1]] = parsed[header][position:position + lengths[i]]
+            position += lengths[i]
+    return data, offsets
+
+
+def extract_features(data, offsets):
+    """
+    Mean and std (ddof=1, like pandas) of every axis for every recording.
+
+    Returns an array of shape (n_recordings, 2 * n_axes) laid out as FEATURE_NAMES.
+    Empty recordings get NaN features, single-sample recordings a NaN std.
+    float32 and int16 data are reduced in float32 instead of being promoted to float64.
+    """
+    data = np.asarray(data)
+    # A dtype= argument to reduceat would cast the whole array anyway, so cast once up front
+    data = data.astype(working_dtype(data.dtype), copy=False)
+    lengths = np.diff(offsets)
+    n_recordings, n_axes = len(lengths), data.shape[1]
+    non_empty = lengths > 0
+    starts = offsets[:-1][non_empty]
+
+    sums = np.zeros((n_recordings, n_axes))
+    if starts.size:
+        sums[non_empty] = np.add.reduceat(data, starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / lengths[:, None]
+
+    # Two-pass variance keeps precision for the large raw sensor counts
+    centered = data - np.repeat(means.astype(data.dtype), lengths, axis=0)
+    centered *= centered
+    squares = np.zeros((n_recordings, n_axes))
+    if starts.size:
+        squares[non_empty] = np.add.reduceat(centered, starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stds = np.sqrt(squares / (lengths[:, None] - 1))
+    stds[lengths < 2] = np.nan
+
+    return pack_features(means, stds)
+
+
+def pack_features(means, stds):
+    """ Interleave per-axis means and stds into the FEATURE_NAMES layout """
+    means = np.asarray(means)
+    features = np.empty(means.shape[:-1] + (2 * means.shape[-1],))
+    features[..., 0::2] = means
+    features[..., 1::2] = stds
+    return features
+
+
+# === Extended Feature Bank ===
+FEATURE_GROUPS = ['basic', 'minmax', 'energy', 'zcr', 'sma', 'fft', 'shape']
+
+
+def resample_segments(data, offsets, length):
+    """ Linearly resample every recording to `length` samples at once, shape (n_recordings, length, n_axes) """
+    data = np.asarray(data, dtype=np.float64)
+    lengths = np.diff(offsets)
+    starts = offsets[:-1]
+
+    # Fractional sample position of every output point inside the stacked array
+    fractions = np.linspace(0, 1, length)
+    positions = starts[:, None] + fractions[None, :] * np.maximum(lengths - 1, 0)[:, None]
+    left = np.floor(positions).astype(np.int64)
+    right = np.minimum(left + 1, np.maximum(offsets[1:] - 1, 0)[:, None])
+    weights = (positions - left)[..., None]
+
+    if not len(data):
+        return np.full((len(lengths), length, data.shape[1]), np.nan)
+    left = np.minimum(left, len(data) - 1)
+    right = np.minimum(right, len(data) - 1)
+    resampled = data[left] * (1 - weights) + data[right] * weights
+    resampled[lengths == 0] = np.nan
+    return resampled
+
+
+def extract_extended_features(data, offsets, groups=FEATURE_GROUPS, shape_length=16, fft_length=64, fft_bands=4):
+    """
+    Feature bank computed in one vectorized pass over the stacked recordings.
+
+    basic   mean and std per axis (the FEATURE_NAMES layout)
+    minmax  min and max per axis
+    energy  mean of squares per axis
+    zcr     zero-crossing rate of the mean-removed signal per axis
+    sma     signal magnitude area of the mean-removed accelerometer and gyroscope
+    fft     spectral energy in `fft_bands` equal bands per axis; the recording is
+            resampled to fft_length points first, so bands are relative to its duration
+    shape   every axis resampled to a fixed shape_length vector
+
+    Returns (features, names).
+    """
+    data = np.asarray(data, dtype=np.float64)
+    lengths = np.diff(offsets)
+    n_recordings, n_axes = len(lengths), data.shape[1]
+    non_empty = lengths > 0
+    starts = offsets[:-1][non_empty]
+
+    def segment_reduce(ufunc, values):
+        reduced = np.full((n_recordings,) + values.shape[1:], np.nan)
+        if starts.size:
+            reduced[non_empty] = ufunc.reduceat(values, starts, axis=0)
+        return reduced
+
+    basic = extract_features(data, offsets)
+    means = basic[:, 0::2]
+    centered = data - np.repeat(np.nan_to_num(means), lengths, axis=0)
+    columns, names = [], []
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if 'basic' in groups:
+            columns.append(basic)
+            names += FEATURE_NAMES
+        if 'minmax' in groups:
+            columns += [segment_reduce(np.minimum, data), segment_reduce(np.maximum, data)]
+            names += [f"{axis}_min" for axis in AXES] + [f"{axis}_max" for axis in AXES]
+        if 'energy' in groups:
+            columns.append(segment_reduce(np.add, data * data) / lengths[:, None])
+            names += [f"{axis}_energy" for axis in AXES]
+        if 'zcr' in groups:
+            # crossings[k] counts sign changes between samples 0..k of the stacked array
+            changes = np.signbit(centered[1:]) != np.signbit(centered[:-1])
+            crossings = np.concatenate([np.zeros((1, n_axes)), np.cumsum(changes, axis=0)])
+            last = np.maximum(offsets[1:] - 1, 0)
+            first = np.minimum(offsets[:-1], last)
+            columns.append((crossings[last] - crossings[first]) / np.maximum(lengths - 1, 1)[:, None])
+            names += [f"{axis}_zcr" for axis in AXES]
+        if 'sma' in groups:
+            magnitudes = np.column_stack([np.abs(centered[:, :3]).sum(axis=1), np.abs(centered[:, 3:]).sum(axis=1)])
+            columns.append(segment_reduce(np.add, magnitudes) / lengths[:, None])
+            names += ['acc_sma', 'gyro_sma']
+        if 'fft' in groups:
+            resampled = resample_segments(data, offsets, fft_length)
+            power = np.abs(np.fft.rfft(resampled - resampled.mean(axis=1, keepdims=True), axis=1)) ** 2
+            # Skip the DC bin, split the rest into equal bands
+            bands = np.array_split(np.arange(1, power.shape[1]), fft_bands)
+            energies = np.stack([power[:, band].sum(axis=1) for band in bands], axis=2) / fft_length
+            columns.append(energies.reshape(n_recordings, -1))
+            names += [f"{axis}_band{band}" for axis in AXES for band in range(fft_bands)]
+        if 'shape' in groups:
+            shape = resample_segments(data, offsets, shape_length)
+            columns.append(shape.transpose(0, 2, 1).reshape(n_recordings, -1))
+            names += [f"{axis}_shape{i}" for axis in AXES for i in range(shape_length)]
+
+    return np.column_stack(columns) if columns else np.empty((n_recordings, 0)), names
+
+
+def select_recordings(data, offsets, indices):
+    """ (data, offsets) of only the given recordings, in the given order """
+    indices = np.asarray(indices, dtype=np.int64)
+    lengths = np.diff(offsets)[indices]
+    new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    rows = np.repeat(offsets[indices] - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return np.asarray(data[rows]), new_offsets
+
+
+def load_labelled_recordings(files_by_label):
+    """ Load {label: [csv paths]} as stacked (data, offsets) plus one label per recording """
+    file_paths = []
+    labels = []
+    for label, label_files in files_by_label.items():
+        file_paths.extend(label_files)
+        labels.extend([label] * len(label_files))
+    data, offsets = load_recordings(file_paths)
+    return data, offsets, np.array(labels)
+
+
+def build_dataset(files_by_label, groups=None):
+    """
+    Load {label: [csv paths]} and return the (X, y) matrices the classifiers train on.
+    Pass feature groups to use the extended feature bank instead of FEATURE_NAMES.
+    """
+    data, offsets, labels = load_labelled_recordings(files_by_label)
+    if groups is None:
+        return extract_features(data, offsets), labels
+    return extract_extended_features(data, offsets, groups)[0], labels
+
+
+def build_series_dataset(files_by_label, length):
+    """ Like build_dataset, but X holds every recording resampled to (length, n_axes) for utils.dtw """
+    data, offsets, labels = load_labelled_recordings(files_by_label)
+    return resample_segments(data, offsets, length), labels
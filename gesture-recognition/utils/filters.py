@@ -0,0 +1,147 @@
+"""
+Causal smoothing filters for (n_samples, n_axes) sensor data.
+
+Every batch filter works on all axes at once, and has a stateful streaming
+counterpart whose update() gives the same output fed one sample at a time.
+"""
+import math
+
+import numpy as np
+from scipy.signal import lfilter
+
+
+def _as_2d(data):
+    data = np.asarray(data, dtype=np.float64)
+    return data[:, None] if data.ndim == 1 else data
+
+
+def _like_input(result, data):
+    return result[:, 0] if np.ndim(data) == 1 else result
+
+
+# === Moving Average ===
+def moving_average(data, window=5):
+    """
+    Trailing mean of the last `window` samples, O(n) through a cumulative sum.
+    The first window - 1 outputs average the samples seen so far.
+
+    float32 and integer data keep their dtype. Integer data is smoothed in
+    fixed point: the window sums are exact int64 and the means are rounded,
+    so int16 counts cannot overflow or drift.
+    """
+    values = np.asarray(data)
+    if values.ndim == 1:
+        values = values[:, None]
+    warmup = min(window, len(values))
+    counts = np.arange(1, warmup + 1)[:, None]
+
+    if values.dtype.kind in 'iu':
+        cumulative = np.cumsum(values, axis=0, dtype=np.int64)
+        smoothed = np.empty(values.shape, dtype=values.dtype)
+        # Integer division rounding half up: floor((sum + n / 2) / n)
+        smoothed[:warmup] = (2 * cumulative[:warmup] + counts) // (2 * counts)
+        smoothed[window:] = (2 * (cumulative[window:] - cumulative[:-window]) + window) // (2 * window)
+        return _like_input(smoothed, data)
+
+    # A float32 running sum would lose the small differences between windows
+    cumulative = np.cumsum(values, axis=0, dtype=np.float64)
+    smoothed = np.empty_like(cumulative)
+    smoothed[:warmup] = cumulative[:warmup] / counts
+    smoothed[window:] = (cumulative[window:] - cumulative[:-window]) / window
+    if values.dtype == np.float32:
+        smoothed = smoothed.astype(np.float32)
+    return _like_input(smoothed, data)
+
+
+class MovingAverageFilter:
+    """
+    Streaming moving_average: keeps the running sum and a ring of its last `window` values.
+    Same dtypes as the batch filter, integer samples go through the same fixed-point sums.
+    """
+
+    def __init__(self, window=5):
+        self.window = window
+        self.total = None
+        self.history = None
+        self.count = 0
+        self.dtype = None
+
+    def update(self, sample):
+        sample = np.asarray(sample)
+        if self.total is None:
+            self.dtype = sample.dtype
+            total_dtype = np.int64 if sample.dtype.kind in 'iu' else np.float64
+            self.total = np.zeros(sample.shape, dtype=total_dtype)
+            self.history = np.zeros((self.window,) + sample.shape, dtype=total_dtype)
+
+        slot = self.count % self.window
+        oldest = self.history[slot].copy()
+        self.total = self.total + sample
+        self.history[slot] = self.total
+        self.count += 1
+
+        n = min(self.count, self.window)
+        window_sum = self.total if self.count <= self.window else self.total - oldest
+        if self.dtype.kind in 'iu':
+            # Integer division rounding half up, as in moving_average
+            return ((2 * window_sum + n) // (2 * n)).astype(self.dtype)
+        mean = window_sum / n
+        return mean.astype(np.float32) if self.dtype == np.float32 else mean
+
+
+# === Exponential Moving Average ===
+def exponential_moving_average(data, alpha=0.3):
+    """ y[n] = y[n-1] + alpha * (x[n] - y[n-1]), starting from y[0] = x[0] """
+    values = _as_2d(data)
+    if not len(values):
+        return _like_input(values.copy(), data)
+    # The recurrence as the IIR filter y[n] = alpha * x[n] + (1 - alpha) * y[n-1], run in C.
+    # The initial state is chosen so that y[0] = x[0]
+    smoothed, _ = lfilter([alpha], [1, alpha - 1], values, axis=0, zi=(1 - alpha) * values[:1])
+    return _like_input(smoothed, data)
+
+
+class EmaFilter:
+    """ Streaming exponential_moving_average """
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.state = None
+
+    def update(self, sample):
+        sample = np.asarray(sample, dtype=np.float64)
+        if self.state is None:
+            self.state = sample.copy()
+        else:
+            self.state = self.state + self.alpha * (sample - self.state)
+        return self.state
+
+
+# === Low-Pass IIR ===
+def lowpass_alpha(cutoff_hz, sample_rate_hz):
+    """ Smoothing factor of a first-order RC low-pass with the given cutoff """
+    dt = 1 / sample_rate_hz
+    rc = 1 / (2 * math.pi * cutoff_hz)
+    return dt / (rc + dt)
+
+
+def lowpass(data, cutoff_hz, sample_rate_hz, order=2):
+    """ `order` cascaded first-order IIR low-pass sections, -6 dB/octave each past the cutoff """
+    alpha = lowpass_alpha(cutoff_hz, sample_rate_hz)
+    smoothed = data
+    for _ in range(order):
+        smoothed = exponential_moving_average(smoothed, alpha)
+    return smoothed
+
+
+class LowPassFilter:
+    """ Streaming lowpass """
+
+    def __init__(self, cutoff_hz, sample_rate_hz, order=2):
+        alpha = lowpass_alpha(cutoff_hz, sample_rate_hz)
+        self.stages = [EmaFilter(alpha) for _ in range(order)]
+
+    def update(self, sample):
+        for stage in self.stages:
+            sample = stage.update(sample)
+        return sample
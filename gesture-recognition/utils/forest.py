@@ -0,0 +1,101 @@
+"""
+Flattened RandomForest for fast inference.
+
+export_forest turns a fitted sklearn RandomForestClassifier into a handful of
+NumPy node arrays; FlatForest evaluates them without importing sklearn and
+walks every row through every tree at once.
+"""
+import numpy as np
+
+
+def _breadth_first(tree):
+    """ Old node ids in an order where the two children of every split are adjacent """
+    order = [0]
+    for node in order:
+        if tree.children_left[node] != -1:
+            order += [tree.children_left[node], tree.children_right[node]]
+    return np.array(order)
+
+
+def export_forest(clf, path):
+    """ Save a fitted RandomForestClassifier as flat node arrays in a .npz file """
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in clf.estimators_:
+        tree = estimator.tree_
+        order = _breadth_first(tree)
+        new_ids = np.empty(tree.node_count, dtype=np.int64)
+        new_ids[order] = np.arange(tree.node_count)
+
+        # Renumbered so the right child is always left child + 1. Leaves point at
+        # themselves with an infinite threshold, so traversal can run a fixed
+        # number of steps without checking for leaves
+        is_leaf = tree.children_left[order] == -1
+        features.append(np.where(is_leaf, 0, tree.feature[order]))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold[order]))
+        children.append(np.where(is_leaf, np.arange(tree.node_count), new_ids[tree.children_left[order]]) + offset)
+
+        # Same leaf normalisation as DecisionTreeClassifier.predict_proba
+        value = tree.value[order, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0] = 1
+        values.append(value / normalizer)
+
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    np.savez(path,
+             feature=np.concatenate(features).astype(np.int32),
+             threshold=np.concatenate(thresholds),
+             children=np.concatenate(children).astype(np.int32),
+             value=np.concatenate(values),
+             roots=np.array(roots, dtype=np.int32),
+             classes=np.asarray(clf.classes_),
+             max_depth=np.int32(max_depth))
+
+
+class FlatForest:
+    """ Predictor for a forest written by export_forest, same predictions as the sklearn model """
+
+    def __init__(self, path):
+        with np.load(path) as arrays:
+            self.feature = arrays['feature']
+            self.threshold = arrays['threshold']
+            self.children = arrays['children']
+            self.value = arrays['value']
+            self.roots = arrays['roots']
+            self.classes_ = arrays['classes']
+            self.max_depth = int(arrays['max_depth'])
+
+    def apply(self, X):
+        """ Leaf index reached in every tree, shape (n_rows, n_trees) """
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat_X = X.ravel()
+        row_starts = (np.arange(len(X)) * X.shape[1])[:, None]
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.max_depth):
+            go_right = flat_X[row_starts + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[nodes] + go_right
+        return nodes
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        # Summed tree by tree like ForestClassifier, so ties break the same way
+        proba = self.value[leaves.T].sum(axis=0)
+        return proba / len(self.roots)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def load_model(path):
+    """ FlatForest for .npz exports, the pickled sklearn model otherwise """
+    if str(path).endswith('.npz'):
+        return FlatForest(path)
+
+    import joblib
+    return joblib.load(path)
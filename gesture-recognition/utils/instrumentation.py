@@ -0,0 +1,135 @@
+"""
+Lightweight timing, counting and profiling for the pipeline scripts.
+
+    run = Instrumentation('classifier')
+    with run.stage('load'):
+        ...
+    run.count('recordings', len(y))
+    run.finish()
+
+finish() appends one JSON line per run to runs/<name>.jsonl, so timings can be
+compared across runs. Environment switches:
+    GESTURE_TRACEMALLOC=1  peak Python memory per stage (slows allocations down)
+    GESTURE_PROFILE=1      cProfile of the whole run, saved next to the summary
+"""
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from utils.catalog import DATA_ROOT
+
+RUNS_DIR = os.path.join(DATA_ROOT, 'runs')
+PROFILE_ENV = 'GESTURE_PROFILE'
+TRACEMALLOC_ENV = 'GESTURE_TRACEMALLOC'
+
+
+def _enabled(variable):
+    return os.environ.get(variable, '').lower() in ('1', 'true', 'yes')
+
+
+class Instrumentation:
+    """ Per-stage wall time (and optionally peak memory) plus free-form counters for one run """
+
+    def __init__(self, name, runs_dir=RUNS_DIR, environment=True):
+        """ environment=False ignores the env switches, for timers inside worker processes """
+        self.name = name
+        self.runs_dir = runs_dir
+        self.started = datetime.now()
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self._open = []
+
+        self.trace_memory = environment and _enabled(TRACEMALLOC_ENV)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.profiler = cProfile.Profile() if environment and _enabled(PROFILE_ENV) else None
+        if self.profiler:
+            self.profiler.enable()
+
+    @contextmanager
+    def stage(self, name):
+        """ Time the enclosed block; repeated stages add up, nested ones are reported separately """
+        if self.trace_memory:
+            base, peak = tracemalloc.get_traced_memory()
+            if self._open:
+                self._open[-1]['peak'] = max(self._open[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame = {'base': base, 'peak': 0}
+            self._open.append(frame)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            stats = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+
+            if self.trace_memory:
+                self._open.pop()
+                peak = max(tracemalloc.get_traced_memory()[1], frame['peak'])
+                stats['peak_kib'] = max(stats.get('peak_kib', 0), (peak - frame['base']) / 1024)
+                # The parent's peak includes everything this stage allocated
+                if self._open:
+                    self._open[-1]['peak'] = max(self._open[-1]['peak'], peak)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, stages):
+        """ Add stage timings collected elsewhere, e.g. returned by a worker process """
+        for name, other in stages.items():
+            stats = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+            stats['calls'] += other['calls']
+            stats['seconds'] += other['seconds']
+            if 'peak_kib' in other:
+                stats['peak_kib'] = max(stats.get('peak_kib', 0), other['peak_kib'])
+
+    def summary(self):
+        summary = {
+            'run': self.name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - self.start, 6),
+            'stages': {name: {key: round(value, 6) if isinstance(value, float) else value
+                              for key, value in stats.items()}
+                       for name, stats in self.stages.items()},
+            'counters': self.counters,
+        }
+        if resource is not None:
+            # KiB on Linux, bytes on macOS
+            summary['max_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return summary
+
+    def finish(self, verbose=True):
+        """ Stop profiling, append the summary to runs/<name>.jsonl and return it """
+        os.makedirs(self.runs_dir, exist_ok=True)
+        stamp = self.started.strftime('%Y%m%d-%H%M%S')
+
+        summary = self.summary()
+        if self.profiler:
+            self.profiler.disable()
+            summary['profile'] = os.path.join(self.runs_dir, f'{self.name}-{stamp}.prof')
+            self.profiler.dump_stats(summary['profile'])
+
+        with open(os.path.join(self.runs_dir, f'{self.name}.jsonl'), 'a') as f:
+            f.write(json.dumps(summary) + '\n')
+
+        if verbose:
+            print(f"\n⏱ {self.name}: {summary['total_seconds']:.2f} s")
+            for name, stats in summary['stages'].items():
+                memory = f"  peak {stats['peak_kib']:,.0f} KiB" if 'peak_kib' in stats else ''
+                print(f"   {name:<20} {stats['seconds']:>9.3f} s  {stats['calls']:>6}x{memory}")
+            for name, value in self.counters.items():
+                print(f"   {name:<20} {value:>9}")
+        return summary
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+
+
+# === Source Fingerprints ===
+def file_hash(file_path=None, content=None):
+    """ SHA-1 of a file on disk, or of bytes that were already read """
+    if content is not None:
+        return hashlib.sha1(content).hexdigest()
+
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(file_path, content=None):
+    stat = os.stat(file_path)
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha1': file_hash(file_path, content),
+    }
+
+
+def is_unchanged(entry, file_path):
+    """
+    True if file_path still matches a fingerprint recorded earlier.
+    Only re-hashes when the cheap mtime/size check fails; a file that was
+    merely touched gets its entry refreshed in place.
+    """
+    if not entry:
+        return False
+    stat = os.stat(file_path)
+    if stat.st_mtime_ns == entry.get('mtime_ns') and stat.st_size == entry.get('size'):
+        return True
+    if stat.st_size != entry.get('size') or file_hash(file_path) != entry.get('sha1'):
+        return False
+    entry['mtime_ns'] = stat.st_mtime_ns
+    return True
+
+
+# === Manifest Files ===
+def load_manifest(manifest_path):
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # A corrupt manifest only costs a full rebuild
+        return {}
+
+
+def save_manifest(manifest_path, manifest):
+    """ Write atomically so an interrupted run never leaves a half-written manifest """
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
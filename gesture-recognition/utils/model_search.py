@@ -0,0 +1,154 @@
+"""
+Grouped k-fold cross-validation over a grid of gesture classifiers.
+
+Folds are grouped by person and recording session (the date in the file name),
+so near-duplicate recordings of one session never end up on both sides of a
+split. Features are extracted once; every (configuration, fold) pair then runs
+as its own job across all cores.
+
+Run from gesture-recognition/:
+    python -m utils.model_search --dataset cleaned --folds 5 --workers -1
+"""
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import ParameterGrid, StratifiedGroupKFold, StratifiedKFold
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from utils.catalog import DATA_ROOT, load_catalog
+from utils.features import extract_extended_features, load_recordings
+
+# === Search Space ===
+MODELS = {
+    'random_forest': lambda **params: RandomForestClassifier(random_state=42, n_jobs=1, **params),
+    'extra_trees': lambda **params: ExtraTreesClassifier(random_state=42, n_jobs=1, **params),
+    'knn': lambda **params: make_pipeline(StandardScaler(), KNeighborsClassifier(**params)),
+    'svm': lambda **params: make_pipeline(StandardScaler(), SVC(**params)),
+    'logistic_regression': lambda **params: make_pipeline(StandardScaler(), LogisticRegression(max_iter=2000, **params)),
+}
+
+PARAM_GRID = {
+    'random_forest': {'n_estimators': [50, 80, 100, 200], 'max_depth': [None, 8], 'min_samples_leaf': [1, 3]},
+    'extra_trees': {'n_estimators': [100, 200], 'max_depth': [None, 8]},
+    'knn': {'n_neighbors': [3, 5, 9], 'weights': ['uniform', 'distance']},
+    'svm': {'C': [1, 10, 100], 'gamma': ['scale', 0.1]},
+    'logistic_regression': {'C': [0.1, 1, 10]},
+}
+
+SESSION_PATTERN = re.compile(r'(\d{8})-\d{6}')
+
+
+def session_groups(entries):
+    """ One group per person and recording day """
+    groups = []
+    for path, entry in entries:
+        match = SESSION_PATTERN.search(os.path.basename(path))
+        groups.append(f"{entry['person']}/{match.group(1) if match else os.path.dirname(path)}")
+    return np.array(groups)
+
+
+def load_features(dataset, gestures=None, feature_groups=('basic',)):
+    """ (X, y, groups) for every recording of the dataset in the catalog """
+    entries = load_catalog().query(dataset, gestures)
+    if not entries:
+        raise ValueError(f"No recordings found for dataset {dataset!r}")
+
+    data, offsets = load_recordings([os.path.join(DATA_ROOT, path) for path, _ in entries])
+    X, _ = extract_extended_features(data, offsets, feature_groups)
+    y = np.array([entry['gesture'] for _, entry in entries])
+    return X, y, session_groups(entries)
+
+
+def run_fold(model_name, params, X, y, train_index, test_index):
+    """ Fit and score one configuration on one fold """
+    model = MODELS[model_name](**params)
+
+    start = time.perf_counter()
+    model.fit(X[train_index], y[train_index])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    accuracy = np.mean(model.predict(X[test_index]) == y[test_index])
+    batch_seconds = (time.perf_counter() - start) / len(test_index)
+
+    # Single-row latency is what the streaming classifier pays per window
+    row = X[test_index[:1]]
+    start = time.perf_counter()
+    for _ in range(10):
+        model.predict(row)
+    row_seconds = (time.perf_counter() - start) / 10
+
+    return fit_seconds, batch_seconds, row_seconds, accuracy
+
+
+def search(X, y, groups, models=None, folds=5, workers=-1):
+    """ Cross-validate every configuration in parallel; returns the leaderboard as a DataFrame """
+    n_groups = len(np.unique(groups))
+    if n_groups >= 2:
+        n_folds = min(folds, n_groups)
+        splitter = StratifiedGroupKFold(n_splits=n_folds, shuffle=True, random_state=42)
+    else:
+        # A single session cannot be split by group; sessions leak across folds, so scores run high
+        n_folds = folds
+        print(f"Warning: only {n_groups} person/session group, falling back to ungrouped stratified folds")
+        splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42)
+        groups = None
+    splits = list(splitter.split(X, y, groups))
+
+    configs = [(name, params) for name in (models or MODELS) for params in ParameterGrid(PARAM_GRID[name])]
+    # Arrays above 1 MB are memory-mapped once and shared with the workers
+    results = Parallel(n_jobs=workers, max_nbytes='1M')(
+        delayed(run_fold)(name, params, X, y, train_index, test_index)
+        for name, params in configs
+        for train_index, test_index in splits
+    )
+
+    rows = []
+    for i, (name, params) in enumerate(configs):
+        fold_results = np.array(results[i * n_folds:(i + 1) * n_folds])
+        rows.append({
+            'model': name,
+            'params': ', '.join(f"{key}={value}" for key, value in params.items()),
+            'accuracy': fold_results[:, 3].mean(),
+            'accuracy_std': fold_results[:, 3].std(),
+            'fit_ms': fold_results[:, 0].mean() * 1e3,
+            'predict_us_per_row': fold_results[:, 1].mean() * 1e6,
+            'single_row_us': fold_results[:, 2].mean() * 1e6,
+        })
+
+    leaderboard = pd.DataFrame(rows).sort_values(['accuracy', 'single_row_us'], ascending=[False, True])
+    return leaderboard.reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dataset', default='cleaned', help="catalog dataset, e.g. cleaned, spells, last-edition")
+    parser.add_argument('--gestures', nargs='+', help="restrict to these gestures")
+    parser.add_argument('--models', nargs='+', choices=MODELS, help="restrict to these models")
+    parser.add_argument('--features', nargs='+', default=['basic'], help="feature groups, see utils.features")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=-1)
+    parser.add_argument('--output', default='leaderboard.csv')
+    args = parser.parse_args()
+
+    X, y, groups = load_features(args.dataset, args.gestures, args.features)
+    print(f"{len(y)} recordings, {X.shape[1]} features, {len(np.unique(groups))} person/session groups")
+
+    start = time.perf_counter()
+    leaderboard = search(X, y, groups, args.models, args.folds, args.workers)
+    print(f"Search finished in {time.perf_counter() - start:.1f} s\n")
+
+    with pd.option_context('display.width', 160, 'display.max_colwidth', 60):
+        print(leaderboard.to_string(float_format=lambda v: f"{v:.3f}"))
+    leaderboard.to_csv(args.output, index=False)
+    print(f"\nLeaderboard saved as {args.output}")
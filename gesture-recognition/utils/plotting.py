@@ -0,0 +1,212 @@
+"""
+Headless batch plotting of recordings to image files.
+
+Recordings are split into chunks and rendered by worker processes with the Agg
+backend. Each worker builds one figure and only swaps the line data between
+recordings, so hundreds of files take seconds instead of one blocking window
+per file. Recordings come from CSV files or from a store written by
+utils/store.py, which every worker memory-maps instead of parsing CSVs.
+
+Run from gesture-recognition/:
+    python -m utils.plotting --dataset raw --gestures Rock --output plots
+    python -m utils.plotting --dataset spells --overlay --output plots
+"""
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from utils.catalog import DATA_ROOT, load_catalog
+from utils.features import AXES, load_recordings, resample_segments
+from utils.store import RecordingStore
+
+ACC_AXES = AXES[:3]
+GYRO_AXES = AXES[3:]
+DPI = 100
+
+# One figure per worker process, created on first use
+_figure = None
+
+
+# === Single Recordings ===
+def _recording_figure():
+    """ Accelerometer and gyroscope panels with one empty line per axis """
+    global _figure
+    if _figure is None:
+        fig, (acc_ax, gyro_ax) = plt.subplots(2, 1, figsize=(12, 6))
+        acc_lines = [acc_ax.plot([], [], label=label)[0] for label in ACC_AXES]
+        gyro_lines = [gyro_ax.plot([], [], label=label)[0] for label in GYRO_AXES]
+        for ax, ylabel in [(acc_ax, 'Acceleration'), (gyro_ax, 'Rotation Rate')]:
+            # Placeholder title so the layout leaves room for the real ones
+            ax.set_title('Title')
+            ax.set_xlabel('Time (s)')
+            ax.set_ylabel(ylabel)
+            ax.legend(loc='upper right')
+        fig.tight_layout()
+        _figure = fig, acc_ax, gyro_ax, acc_lines + gyro_lines
+    return _figure
+
+
+def _draw_recording(time_s, samples, title, output_path):
+    """ Save one (n_samples, 6) recording with this process's figure """
+    fig, acc_ax, gyro_ax, lines = _recording_figure()
+    for line, column in zip(lines, samples.T):
+        line.set_data(time_s, column)
+    for ax in (acc_ax, gyro_ax):
+        ax.relim()
+        ax.autoscale_view()
+    acc_ax.set_title(f'Accelerometer Data - {title}')
+    gyro_ax.set_title(f'Gyroscope Data - {title}')
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    fig.savefig(output_path, dpi=DPI)
+
+
+def _render_chunk(jobs):
+    """ Render [(file path, title, output path)]; returns the number written """
+    data, offsets = load_recordings([file_path for file_path, _, _ in jobs], columns=['time'] + AXES)
+    for i, (_, title, output_path) in enumerate(jobs):
+        recording = data[offsets[i]:offsets[i + 1]]
+        _draw_recording(recording[:, 0] / 1000, recording[:, 1:], title, output_path)
+    return len(jobs)
+
+
+def _render_store_chunk(store_dir, jobs):
+    """ Render [(store index, title, output path)] straight from the memory-mapped store """
+    store = RecordingStore(store_dir)
+    for index, title, output_path in jobs:
+        time_s, samples = store.recording(index)
+        _draw_recording(time_s, samples, title, output_path)
+    return len(jobs)
+
+
+def _run_chunks(render, jobs, workers):
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        render(jobs)
+        return
+    # A few chunks per worker keeps them busy without paying a figure per file
+    size = math.ceil(len(jobs) / (workers * 4))
+    chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(render, chunks))
+
+
+def output_path_for(file_path, output_dir, fmt='png'):
+    """ <output_dir>/<gesture>/<recording>.<fmt>, mirroring the data layout """
+    gesture = os.path.basename(os.path.dirname(file_path))
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(output_dir, gesture, f'{name}.{fmt}')
+
+
+def render_recordings(file_paths, output_dir, workers=None, fmt='png'):
+    """ One accelerometer/gyroscope image per recording; returns the written paths """
+    jobs = [
+        (file_path, os.path.relpath(file_path, DATA_ROOT), output_path_for(file_path, output_dir, fmt))
+        for file_path in file_paths
+    ]
+    if not jobs:
+        return []
+
+    _run_chunks(_render_chunk, jobs, workers)
+    return [output_path for _, _, output_path in jobs]
+
+
+def render_store_recordings(store_dir, output_dir, gestures=None, persons=None, workers=None, fmt='png'):
+    """ Same as render_recordings for the selected recordings of a store; returns the written paths """
+    store = RecordingStore(store_dir)
+    jobs = []
+    for index in store.select(gestures, persons):
+        gesture, file_name = store.gestures[index], store.files[index]
+        output_path = os.path.join(output_dir, gesture, f'{os.path.splitext(file_name)[0]}.{fmt}')
+        jobs.append((int(index), f'{gesture}/{file_name}', output_path))
+    if not jobs:
+        return []
+
+    _run_chunks(partial(_render_store_chunk, store_dir), jobs, workers)
+    return [output_path for _, _, output_path in jobs]
+
+
+# === Overlay ===
+def render_overlay(file_paths, output_path, title='', length=100, show_traces=True):
+    """
+    Mean ± std band of all recordings on a normalized time axis, one panel per
+    axis. With show_traces every recording is drawn faintly behind the band,
+    so outliers stand out at a glance.
+    """
+    data, offsets = load_recordings(file_paths)
+    return render_overlay_arrays(data, offsets, output_path, title, length, show_traces)
+
+
+def render_overlay_arrays(data, offsets, output_path, title='', length=100, show_traces=True):
+    """ render_overlay for stacked (data, offsets) recordings, e.g. from RecordingStore.recordings() """
+    segments = resample_segments(data, offsets, length)
+    segments = segments[np.diff(offsets) > 0]
+    if not len(segments):
+        raise ValueError("No samples to plot")
+
+    mean = segments.mean(axis=0)
+    std = segments.std(axis=0)
+    x = np.linspace(0, 1, length)
+
+    fig, axes = plt.subplots(3, 2, figsize=(14, 9), sharex=True)
+    for i, name in enumerate(AXES):
+        ax = axes[i % 3, i // 3]
+        if show_traces:
+            traces = np.stack([np.broadcast_to(x, (len(segments), length)), segments[:, :, i]], axis=-1)
+            ax.add_collection(LineCollection(traces, colors='gray', linewidths=0.5, alpha=0.15))
+        ax.plot(x, mean[:, i], 'b-', linewidth=2, label='Mean Pattern')
+        ax.fill_between(x, mean[:, i] - std[:, i], mean[:, i] + std[:, i],
+                        color='blue', alpha=0.2, label='Variation Range')
+        ax.set_title(name)
+        ax.grid(True)
+    axes[0, 0].legend(loc='upper right')
+    axes[-1, 0].set_xlabel('Normalized Time')
+    axes[-1, 1].set_xlabel('Normalized Time')
+    fig.suptitle(f'{title} ({len(segments)} recordings)' if title else f'{len(segments)} recordings')
+    fig.tight_layout()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    fig.savefig(output_path, dpi=DPI)
+    plt.close(fig)
+    return output_path
+
+
+def render_gesture_overlays(catalog, dataset, gestures, output_dir, persons=None, fmt='png'):
+    """ One overlay image per gesture of the dataset; returns the written paths """
+    written = []
+    for gesture in gestures:
+        files = catalog.paths(dataset, [gesture], persons)
+        if files:
+            output_path = os.path.join(output_dir, f'{gesture}_overlay.{fmt}')
+            written.append(render_overlay(files, output_path, title=f'{dataset} / {gesture}'))
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dataset', default='raw', help="catalog dataset, e.g. raw, cleaned, spells")
+    parser.add_argument('--gestures', nargs='+', help="restrict to these gestures")
+    parser.add_argument('--persons', nargs='+', help="restrict to these persons")
+    parser.add_argument('--output', default='plots')
+    parser.add_argument('--overlay', action='store_true', help="one mean ± std image per gesture instead")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--format', default='png')
+    args = parser.parse_args()
+
+    catalog = load_catalog()
+    gestures = args.gestures or catalog.gestures(args.dataset)
+    if args.overlay:
+        written = render_gesture_overlays(catalog, args.dataset, gestures, args.output, args.persons, args.format)
+    else:
+        written = render_recordings(catalog.paths(args.dataset, gestures, args.persons),
+                                    args.output, args.workers, args.format)
+    print(f"{len(written)} images written to {args.output}")
@@ -0,0 +1,59 @@
+import numpy as np
+
+from utils.features import quantize, working_dtype
+
+# Integer millisecond offsets 0, step, 2 * step, ... per step size, grown on demand
+_grids = {}
+
+
+def time_grid(start_ms, stop_ms, interval=0.05):
+    """ Timestamps in ms from start_ms (inclusive) to stop_ms (exclusive) every `interval` seconds """
+    step_ms = int(round(interval * 1000))
+    if step_ms <= 0:
+        raise ValueError(f"interval must be at least 1 ms, got {interval}")
+
+    n = max(0, -(-(int(stop_ms) - int(start_ms)) // step_ms))
+    grid = _grids.get(step_ms)
+    if grid is None or len(grid) < n:
+        grid = np.arange(max(n, 1024), dtype=np.int64) * step_ms
+        _grids[step_ms] = grid
+    return int(start_ms) + grid[:n]
+
+
+def resample(times_ms, values, interval=0.05):
+    """
+    Linearly resample all axes of a recording onto a fixed time grid in one pass.
+
+    times_ms: (n,) sample timestamps in ms, values: (n, n_axes).
+    Duplicate timestamps keep their first sample. The grid runs from the first
+    timestamp up to (not including) the last one, like the old RangeIndex grid,
+    but every sample contributes instead of only those landing on the grid.
+    Returns (time_s, resampled) with resampled shaped (n_grid, n_axes).
+    float32 and integer values keep their dtype; integers are interpolated in
+    float32 and rounded back.
+    """
+    times_ms = np.asarray(times_ms, dtype=np.float64)
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    # np.unique sorts and returns the first index of every timestamp
+    times_ms, first = np.unique(times_ms, return_index=True)
+    values = values[first]
+
+    work = working_dtype(values.dtype)
+    fixed_point = values.dtype.kind in 'iu'
+    if len(times_ms) < 2:
+        return np.empty(0), np.empty((0, values.shape[1]), dtype=values.dtype if fixed_point else work)
+
+    grid = time_grid(times_ms[0], times_ms[-1], interval)
+    right = np.clip(np.searchsorted(times_ms, grid, side='right'), 1, len(times_ms) - 1)
+    left = right - 1
+    weights = (grid - times_ms[left]) / (times_ms[right] - times_ms[left])
+
+    # Same arithmetic as np.interp, applied to every axis at once
+    start = values[left].astype(work, copy=False)
+    resampled = start + (values[right].astype(work, copy=False) - start) * weights.astype(work)[:, None]
+    if fixed_point:
+        resampled = quantize(resampled, values.dtype)
+    return grid / 1000, resampled
@@ -0,0 +1,155 @@
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+from utils.features import AXES, load_recordings, pack_features
+from utils.forest import load_model
+
+
+def segment_features(segment):
+    """ Mean/std (ddof=1) features of one (n_samples, n_axes) segment, the layout classifier.py trains on """
+    return pack_features(segment.mean(axis=0), segment.std(axis=0, ddof=1))
+
+
+class MotionSegmenter:
+    """
+    Cut a continuous accX..gyroZ stream into gesture segments by motion energy.
+
+    A fast exponential moving mean and variance follow every axis; the motion
+    energy of a sample is that short-term variance relative to the sensor noise,
+    averaged over the axes. The noise level is itself a slow EMA of the
+    short-term variance while the stream is at rest, so a new rest pose after a
+    gesture does not count as motion.
+    A segment starts when the energy rises above start_threshold and ends once
+    it has stayed below stop_threshold for `hold` samples, so short pauses
+    inside a gesture do not split it. Only the current segment is buffered;
+    every sample costs O(1).
+
+    Defaults are in samples at the 20 Hz of the cleaned recordings.
+    """
+
+    def __init__(self, start_threshold=6.0, stop_threshold=2.0, hold=5, min_length=10, max_length=80,
+                 pre_roll=4, warmup=20, rest_alpha=0.02, energy_alpha=0.3, min_std=200.0):
+        if stop_threshold > start_threshold:
+            raise ValueError("stop_threshold must not exceed start_threshold")
+
+        self.start_threshold = start_threshold
+        self.stop_threshold = stop_threshold
+        self.hold = hold
+        self.min_length = min_length
+        self.max_length = max_length
+        self.warmup = warmup
+        self.rest_alpha = rest_alpha
+        self.energy_alpha = energy_alpha
+        self.min_variance = min_std ** 2
+
+        self.pre_roll = deque(maxlen=pre_roll)
+        self.buffer = np.empty((max_length + pre_roll, len(AXES)))
+        self.reset()
+
+    def reset(self):
+        self.mean = None
+        self.variance = np.zeros(len(AXES))
+        self.noise = np.full(len(AXES), self.min_variance)
+        self.energy = 0.0
+        self.pre_roll.clear()
+        self.active = False
+        self.length = 0
+        self.quiet = 0
+        self.start = 0
+        self.samples_seen = 0
+
+    def _finish(self, stop):
+        """ Close the current segment; returns (start, stop, samples) or None if it was too short """
+        self.active = False
+        self.pre_roll.clear()
+        length, self.length, self.quiet = stop - self.start, 0, 0
+        if length < self.min_length:
+            return None
+        return self.start, stop, self.buffer[:length].copy()
+
+    def push(self, sample):
+        """ Add one (accX, accY, accZ, gyroX, gyroY, gyroZ) sample; returns a finished segment or None """
+        sample = np.asarray(sample, dtype=np.float64)
+        index = self.samples_seen
+        self.samples_seen += 1
+
+        if self.mean is None:
+            self.mean = sample.copy()
+        delta = sample - self.mean
+        self.mean = self.mean + self.energy_alpha * delta
+        self.variance = (1 - self.energy_alpha) * (self.variance + self.energy_alpha * delta * delta)
+        self.energy = np.mean(self.variance / np.maximum(self.noise, self.min_variance))
+
+        if not self.active:
+            if self.samples_seen > self.warmup and self.energy > self.start_threshold:
+                # Include the samples just before the trigger, the onset is below threshold
+                self.active = True
+                self.start = index - len(self.pre_roll)
+                self.length = len(self.pre_roll)
+                if self.length:
+                    self.buffer[:self.length] = self.pre_roll
+            else:
+                self.noise += self.rest_alpha * (self.variance - self.noise)
+                self.pre_roll.append(sample)
+                return None
+
+        self.buffer[self.length] = sample
+        self.length += 1
+        self.quiet = self.quiet + 1 if self.energy < self.stop_threshold else 0
+
+        if self.quiet >= self.hold:
+            # The trailing quiet samples are rest, not gesture
+            return self._finish(index + 1 - self.quiet)
+        if self.length == len(self.buffer):
+            return self._finish(index + 1)
+        return None
+
+    def run(self, samples):
+        """ Yield (start, stop, samples) for every segment over an iterable of samples """
+        for sample in samples:
+            segment = self.push(sample)
+            if segment is not None:
+                yield segment
+
+
+class SegmentClassifier:
+    """ Hand every segment a MotionSegmenter cuts from the stream to a trained classifier """
+
+    def __init__(self, model, segmenter=None, featurize=segment_features):
+        self.model = model
+        self.segmenter = segmenter or MotionSegmenter()
+        self.featurize = featurize
+
+    def push(self, sample):
+        """ Add one sample; returns (start, stop, label) when a gesture just ended, else None """
+        segment = self.segmenter.push(sample)
+        if segment is None:
+            return None
+        start, stop, samples = segment
+        return start, stop, self.model.predict(self.featurize(samples)[None, :])[0]
+
+    def run(self, samples):
+        for sample in samples:
+            result = self.push(sample)
+            if result is not None:
+                yield result
+
+
+# === Replay a continuous recording as if it were a live stream ===
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Segment and classify a continuous CSV stream")
+    parser.add_argument('model', help="path to gesture_model.pkl or its gesture_model.npz export")
+    parser.add_argument('recordings', nargs='+', help="semicolon CSV recordings, streamed back to back")
+    args = parser.parse_args()
+
+    classifier = SegmentClassifier(load_model(args.model))
+    data, _ = load_recordings(args.recordings)
+
+    start = time.perf_counter()
+    for first, last, label in classifier.run(data):
+        print(f"samples {first}-{last}: {label}")
+    seconds = time.perf_counter() - start
+    print(f"{len(data)} samples in {seconds:.3f} s ({len(data) / seconds:,.0f} samples/s)")
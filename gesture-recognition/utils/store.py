@@ -0,0 +1,93 @@
+import json
+import os
+
+import numpy as np
+
+from utils.features import (AXES, extract_features, load_recordings, quantize, resample_segments,
+                            select_recordings, working_dtype)
+
+# === Store Layout ===
+# axes.npy     float32 or int16 (n_axes, n_samples), every axis is one contiguous row
+# time_s.npy   float32 (n_samples,)
+# offsets.npy  int64 (n_recordings + 1,), recording i is [offsets[i], offsets[i + 1])
+# labels.json  axis names plus gesture/person/source file of every recording
+AXES_FILE = 'axes.npy'
+TIME_FILE = 'time_s.npy'
+OFFSETS_FILE = 'offsets.npy'
+LABELS_FILE = 'labels.json'
+
+
+def write_store(store_dir, file_paths, gestures, persons, dtype=np.float32):
+    """ Parse cleaned CSVs once and write them as a columnar, memory-mappable store of `dtype` samples """
+    data, offsets = load_recordings(file_paths, columns=['time_s'] + AXES, dtype=working_dtype(dtype))
+
+    os.makedirs(store_dir, exist_ok=True)
+    np.save(os.path.join(store_dir, AXES_FILE), np.ascontiguousarray(quantize(data[:, 1:].T, dtype)))
+    np.save(os.path.join(store_dir, TIME_FILE), np.ascontiguousarray(data[:, 0], dtype=np.float32))
+    np.save(os.path.join(store_dir, OFFSETS_FILE), offsets)
+
+    labels = {
+        'axes': AXES,
+        'recordings': [
+            {'gesture': gesture, 'person': person, 'file': os.path.basename(file_path)}
+            for file_path, gesture, person in zip(file_paths, gestures, persons)
+        ],
+    }
+    # Labels last: a store without labels.json is treated as missing
+    with open(os.path.join(store_dir, LABELS_FILE), 'w') as f:
+        json.dump(labels, f, indent=1)
+
+
+def store_exists(store_dir):
+    return os.path.exists(os.path.join(store_dir, LABELS_FILE))
+
+
+class RecordingStore:
+    """ Read-only view of a store; the sample arrays are memory-mapped, not parsed """
+
+    def __init__(self, store_dir):
+        with open(os.path.join(store_dir, LABELS_FILE)) as f:
+            labels = json.load(f)
+
+        self.axis_names = labels['axes']
+        self.gestures = np.array([r['gesture'] for r in labels['recordings']])
+        self.persons = np.array([r['person'] for r in labels['recordings']])
+        self.files = [r['file'] for r in labels['recordings']]
+
+        self.offsets = np.load(os.path.join(store_dir, OFFSETS_FILE))
+        self.time_s = np.load(os.path.join(store_dir, TIME_FILE), mmap_mode='r')
+        # (n_samples, n_axes) view over the per-axis rows, no copy
+        self.data = np.load(os.path.join(store_dir, AXES_FILE), mmap_mode='r').T
+
+    def __len__(self):
+        return len(self.files)
+
+    def recording(self, i):
+        """ (time_s, data) of recording i, both views into the store """
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        return self.time_s[start:stop], self.data[start:stop]
+
+    def select(self, gestures=None, persons=None):
+        """ Indices of the recordings matching the given gestures/persons """
+        mask = np.ones(len(self), dtype=bool)
+        if gestures is not None:
+            mask &= np.isin(self.gestures, gestures)
+        if persons is not None:
+            mask &= np.isin(self.persons, persons)
+        return np.flatnonzero(mask)
+
+    def recordings(self, gestures=None, persons=None):
+        """ (data, offsets, labels) of the selected recordings, copied out of the store """
+        indices = self.select(gestures, persons)
+        data, offsets = select_recordings(self.data, self.offsets, indices)
+        return data, offsets, self.gestures[indices]
+
+    def dataset(self, gestures=None, persons=None):
+        """ (X, y) for the selected recordings, same features as utils.features.build_dataset """
+        data, offsets, labels = self.recordings(gestures, persons)
+        return extract_features(data, offsets), labels
+
+    def series(self, length, gestures=None, persons=None):
+        """ (X, y) with every selected recording resampled to (length, n_axes), see utils.dtw """
+        data, offsets, labels = self.recordings(gestures, persons)
+        return resample_segments(data, offsets, length), labels
@@ -0,0 +1,105 @@
+import argparse
+import time
+
+import numpy as np
+
+from utils.features import AXES, load_recordings, pack_features
+from utils.forest import load_model
+
+# Running statistics are rebuilt from the ring buffer this often to stop float drift
+RESYNC_EVERY = 4096
+
+
+class StreamingClassifier:
+    """
+    Classify a live IMU stream one accX..gyroZ sample at a time.
+
+    Keeps the last window_size samples in a fixed ring buffer together with a
+    sliding (Welford) per-axis mean and sum of squared deviations, so every
+    sample costs O(1) and the 12 features are the same mean/std (ddof=1)
+    layout classifier.py trains on.
+    A prediction is made every `step` samples once the window is full.
+    """
+
+    def __init__(self, model, window_size=40, step=10):
+        if window_size < 2:
+            raise ValueError("window_size must be at least 2 samples")
+
+        self.model = model
+        self.window_size = window_size
+        self.step = step
+        self.buffer = np.zeros((window_size, len(AXES)))
+        self.reset()
+
+    def reset(self):
+        self.buffer[:] = 0
+        self.means = np.zeros(len(AXES))
+        self.deviations = np.zeros(len(AXES))
+        self.position = 0
+        self.count = 0
+        self.samples_seen = 0
+
+    def features(self):
+        """ Features of the current window, shape (12,) """
+        variances = np.maximum(self.deviations, 0) / (self.count - 1)
+        return pack_features(self.means, np.sqrt(variances))
+
+    def push(self, sample):
+        """ Add one (accX, accY, accZ, gyroX, gyroY, gyroZ) sample; returns a label or None """
+        sample = np.asarray(sample, dtype=np.float64)
+        if self.count == self.window_size:
+            # Replace the oldest sample, window length stays the same
+            oldest = self.buffer[self.position]
+            means = self.means + (sample - oldest) / self.count
+            self.deviations += (sample - oldest) * (sample - means + oldest - self.means)
+            self.means = means
+        else:
+            self.count += 1
+            delta = sample - self.means
+            self.means = self.means + delta / self.count
+            self.deviations += delta * (sample - self.means)
+
+        self.buffer[self.position] = sample
+        self.position = (self.position + 1) % self.window_size
+        self.samples_seen += 1
+
+        if self.samples_seen % RESYNC_EVERY == 0:
+            window = self.buffer[:self.count]
+            self.means = window.mean(axis=0)
+            self.deviations = ((window - self.means) ** 2).sum(axis=0)
+
+        if self.count == self.window_size and (self.samples_seen - self.window_size) % self.step == 0:
+            return self.model.predict(self.features()[None, :])[0]
+        return None
+
+    def run(self, samples):
+        """ Yield (sample index, label) for every window emitted over an iterable of samples """
+        for sample in samples:
+            label = self.push(sample)
+            if label is not None:
+                yield self.samples_seen - 1, label
+
+
+# === Replay a recording as if it were a live stream ===
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay CSV recordings through the streaming classifier")
+    parser.add_argument('model', help="path to gesture_model.pkl or its gesture_model.npz export")
+    parser.add_argument('recordings', nargs='+', help="semicolon CSV recordings, streamed back to back")
+    parser.add_argument('--window', type=int, default=40)
+    parser.add_argument('--step', type=int, default=10)
+    args = parser.parse_args()
+
+    classifier = StreamingClassifier(load_model(args.model), args.window, args.step)
+    data, _ = load_recordings(args.recordings)
+
+    latencies = []
+    for sample in data:
+        start = time.perf_counter()
+        label = classifier.push(sample)
+        latencies.append(time.perf_counter() - start)
+        if label is not None:
+            print(f"sample {classifier.samples_seen - 1}: {label}")
+
+    latencies = np.array(latencies) * 1e6
+    print(f"{len(latencies)} samples, per-sample latency mean {latencies.mean():.1f} µs, "
+          f"p99 {np.percentile(latencies, 99):.1f} µs, max {latencies.max():.1f} µs")
@@ -0,0 +1,155 @@
+"""
+Dataset-wide validation of raw recordings in one vectorized pass.
+
+Every recording is checked for int16 saturation, duplicate timestamps and
+rows, timestamp gaps and jitter, and for being too short to classify. The
+result is one report row per recording; repair_recording fixes what can be
+fixed before a file is preprocessed.
+
+Run from gesture-recognition/:  python -m utils.validation --dataset spells
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from utils.catalog import DATA_ROOT, load_catalog
+from utils.features import AXES, load_recordings, quantize
+
+# int16 sensor range, values at the limits are clipped readings
+SATURATION_LOW = -32768
+SATURATION_HIGH = 32767
+
+ISSUES = ['saturated', 'duplicate_timestamps', 'duplicate_rows', 'gaps', 'jitter', 'too_short']
+
+
+def _per_recording(ids, weights, n):
+    return np.bincount(ids, weights=weights, minlength=n)
+
+
+def validate_recordings(data, offsets, min_samples=10, max_gap_ms=500, max_jitter=0.25):
+    """
+    Validate stacked recordings, data laid out as load_recordings(columns=['time'] + AXES).
+
+    Returns a DataFrame with one row per recording: issue counts, the longest
+    run of samples without a gap (what repair_recording keeps) and one boolean
+    column per entry of ISSUES.
+    """
+    lengths = np.diff(offsets)
+    n = len(lengths)
+    ids = np.repeat(np.arange(n), lengths)
+    times, values = data[:, 0], data[:, 1:]
+
+    saturated = ((values <= SATURATION_LOW) | (values >= SATURATION_HIGH)).any(axis=1)
+
+    # Intervals between neighbouring samples of the same recording
+    inside = ids[1:] == ids[:-1]
+    interval_ids = ids[1:][inside]
+    intervals = np.diff(times)[inside]
+    forward = intervals > 0
+    expected = np.median(intervals[forward]) if forward.any() else np.nan
+
+    counts = _per_recording(interval_ids[forward], None, n)
+    sums = _per_recording(interval_ids[forward], intervals[forward], n)
+    squares = _per_recording(interval_ids[forward], intervals[forward] ** 2, n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        jitter = np.sqrt(np.maximum(squares / counts - means ** 2, 0)) / expected
+
+    max_interval = np.zeros(n)
+    np.maximum.at(max_interval, interval_ids, intervals)
+
+    # Longest stretch without a gap: break runs at gaps and at recording boundaries
+    is_gap = intervals > max_gap_ms
+    breaks = np.ones(len(data), dtype=bool)
+    breaks[1:] = ~inside
+    breaks[1:][np.flatnonzero(inside)[is_gap]] = True
+    runs = np.cumsum(breaks) - 1
+    run_lengths = np.bincount(runs, minlength=runs[-1] + 1 if len(runs) else 0)
+    run_ids = ids[breaks]
+    longest_run = np.zeros(n, dtype=np.int64)
+    np.maximum.at(longest_run, run_ids, run_lengths)
+
+    # Exact duplicates of time and every axis within one recording
+    unique_rows = np.unique(np.column_stack([ids, data]), axis=0)
+    duplicate_rows = lengths - np.bincount(unique_rows[:, 0].astype(np.int64), minlength=n)
+
+    report = pd.DataFrame({
+        'samples': lengths,
+        'saturated_samples': _per_recording(ids, saturated, n).astype(np.int64),
+        'duplicate_timestamp_count': _per_recording(interval_ids, intervals == 0, n).astype(np.int64),
+        'duplicate_row_count': duplicate_rows,
+        'gap_count': _per_recording(interval_ids, is_gap, n).astype(np.int64),
+        'max_interval_ms': max_interval,
+        'interval_jitter': jitter,
+        'longest_run': longest_run,
+    })
+    report['saturated'] = report['saturated_samples'] > 0
+    report['duplicate_timestamps'] = report['duplicate_timestamp_count'] > 0
+    report['duplicate_rows'] = report['duplicate_row_count'] > 0
+    report['gaps'] = report['gap_count'] > 0
+    report['jitter'] = report['interval_jitter'] > max_jitter
+    report['too_short'] = report['longest_run'] < min_samples
+    return report
+
+
+def validate_files(file_paths, min_samples=10, max_gap_ms=500, max_jitter=0.25):
+    """ validate_recordings over CSV files, with their paths in a `file` column """
+    data, offsets = load_recordings(file_paths, columns=['time'] + AXES)
+    report = validate_recordings(data, offsets, min_samples, max_gap_ms, max_jitter)
+    report.insert(0, 'file', list(file_paths))
+    return report
+
+
+def repair_recording(times, values, max_gap_ms=500):
+    """
+    Repair one recording: drop duplicate rows and repeated timestamps (keeping
+    the first), keep only the longest stretch without a gap and interpolate
+    saturated values from their neighbours. Returns (kept row indices, repaired values),
+    the values in the dtype they came in.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.array(values)
+
+    keep = np.ones(len(times), dtype=bool)
+    keep[1:] = np.diff(times) != 0
+    keep = np.flatnonzero(keep)
+    times, values = times[keep], values[keep]
+
+    if len(times) > 1:
+        runs = np.concatenate([[0], np.cumsum(np.diff(times) > max_gap_ms)])
+        in_run = runs == np.argmax(np.bincount(runs))
+        keep, times, values = keep[in_run], times[in_run], values[in_run]
+
+    saturated = (values <= SATURATION_LOW) | (values >= SATURATION_HIGH)
+    for axis in np.flatnonzero(saturated.any(axis=0)):
+        valid = ~saturated[:, axis]
+        if valid.any():
+            values[~valid, axis] = quantize(np.interp(times[~valid], times[valid], values[valid, axis]),
+                                            values.dtype)
+    return keep, values
+
+
+def summarize(report):
+    """ How many recordings have each issue, as one line """
+    return ', '.join(f"{int(report[issue].sum())} {issue.replace('_', ' ')}" for issue in ISSUES)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dataset', default='raw', help="catalog dataset, e.g. raw, spells, last-edition")
+    parser.add_argument('--min-samples', type=int, default=10)
+    parser.add_argument('--max-gap-ms', type=float, default=500)
+    parser.add_argument('--output', default='validation_report.csv')
+    args = parser.parse_args()
+
+    files = load_catalog().paths(args.dataset)
+    report = validate_files(files, args.min_samples, args.max_gap_ms)
+    report['file'] = [path[len(DATA_ROOT) + 1:] for path in report['file']]
+    report.to_csv(args.output, sep=';', index=False)
+
+    print(f"{len(report)} recordings: {summarize(report)}")
+    flagged = report[report[ISSUES].any(axis=1)]
+    for _, row in flagged.iterrows():
+        print(f"  {row['file']}: {', '.join(issue for issue in ISSUES if row[issue])}")
+    print(f"Report saved as {args.output}")